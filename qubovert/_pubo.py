@@ -18,18 +18,57 @@ Contains the PUBO class. See ``help(qubovert.PUBO)``.
 
 """
 
+from bisect import bisect_left, insort
 from collections import defaultdict
-from .utils import BO, PUBOMatrix, QUBOMatrix
+from itertools import combinations
+from .utils import (
+    BO, PUBOMatrix, QUBOMatrix, PUSOMatrix, QUSOMatrix,
+    pubo_to_puso, qubo_to_quso
+)
 from . import QUBO
-# in PUBO._reduce_degree, we use PCBO.add_constraint_AND. But PCBO inherits
-# from PUBO, so can't say `from . import PCBO` here. Instead, just import
-# qubovert
-import qubovert as qv
 
 
 __all__ = 'PUBO',
 
 
+def _reduction_pair(key, partners, pair_frequencies):
+    """_reduction_pair.
+
+    Find the variable pair in ``key`` to replace with an ancilla. A pair that
+    has already been reduced or that the user prioritized is returned first,
+    and otherwise the pair with the greatest frequency.
+
+    Parameters
+    ----------
+    key : sequence of integers.
+        The sorted key to reduce. Must have at least two elements.
+    partners : dict.
+        Maps each variable ``x`` to the set of variables ``y > x`` such that
+        the pair ``(x, y)`` has already been reduced or was prioritized by the
+        user.
+    pair_frequencies : collections.defaultdict(int).
+        Maps variable pairs to the number of times they occur in the model.
+
+    Return
+    ------
+    pair : tuple (x, y).
+        The pair of variables in ``key`` to reduce, with ``x < y``.
+
+    """
+    # only variables that have partners can be part of a prioritized pair, so
+    # we skip straight past the rest instead of probing every pair.
+    for i, x in enumerate(key[:-1]):
+        p = partners.get(x)
+        if p:
+            for y in key[i+1:]:
+                if y in p:
+                    return x, y
+
+    # max returns the first pair with the greatest frequency, so ties are
+    # broken in the same order that the pairs are generated.
+    return max(combinations(key, 2), key=pair_frequencies.__getitem__)
+
+
 class PUBO(BO, PUBOMatrix):
     """PUBO.
 
@@ -171,6 +210,13 @@ class PUBO(BO, PUBOMatrix):
         order model can be read from the solution to the lower degree model by
         using the ``self.convert_solution`` method.
 
+        Every term is reduced with the same pairwise substitution, even when
+        a group of terms forms a symmetric polynomial that a dedicated
+        symmetric reduction could handle with fewer ancillas. The pairwise
+        substitution works for any labels and coefficients (including
+        symbolic ones) and keeps the ancilla assignment predictable, which
+        ``convert_solution`` and the ``pairs`` argument depend on.
+
         Parameters
         ----------
         D : ``qubovert.utils.QUBOMatrix`` or ``qubovert.utils.QUSOMatrix``.
@@ -222,93 +268,197 @@ class PUBO(BO, PUBOMatrix):
         else:
             def func_lam(v): return lam
 
+        # bind the mapping locally to avoid attribute lookups in the loops
+        mapping = self._mapping
+
+        if deg >= self.degree:
+            # there is nothing to reduce (eg a QUBO given to to_qubo), so skip
+            # the pair counting and just relabel the terms.
+            terms = {}
+            for k, v in self.items():
+                key = tuple(sorted(map(mapping.__getitem__, k)))
+                terms[key] = terms.get(key, 0) + v
+            D._update_squashed(terms)
+            return
+
         # map the pair variables
         pairs = {
-            tuple(sorted(self._mapping[i] for i in p))
-            if all(i in self._mapping for i in p) else ()
+            tuple(sorted(mapping[i] for i in p))
+            if all(i in mapping for i in p) else ()
             for p in pairs or {}
         }
 
-        # determine the most common pairs
-        pair_frequencies, mapped_self = defaultdict(int), {}
-        for k, v in self.items():
-            key = tuple(sorted(self._mapping[i] for i in k))
-            mapped_self[key] = mapped_self.get(key, 0) + v
-            len_key = len(key)
-            for i in range(len_key):
-                for j in range(i + 1, len_key):
-                    pair = key[i], key[j]
-                    pair_frequencies[pair] += 1
-
-        # next available label
-        ancilla = self.num_binary_variables
-
-        # do the reductions
-        reductions = {}
+        # determine the most common pairs. The relabelled terms and their
+        # pair counts do not depend on deg, lam, or pairs, so they are counted
+        # in one traversal and shared by every reduction until self is
+        # modified. The reduction updates the counts, so it works on a copy.
+        counted = self._cache.get('pair_frequencies')
+        if counted is None:
+            frequencies, mapped_self = defaultdict(int), {}
+            for k, v in self.items():
+                key = tuple(sorted(map(mapping.__getitem__, k)))
+                mapped_self[key] = mapped_self.get(key, 0) + v
+                for pair in combinations(key, 2):
+                    frequencies[pair] += 1
+            counted = self._cache['pair_frequencies'] = (
+                mapped_self, frequencies
+            )
+        mapped_self, pair_frequencies = counted[0], counted[1].copy()
+
+        # next available label. A zero valued term can leave variables in the
+        # mapping that num_binary_variables does not count, so start after
+        # every mapped label.
+        ancilla = len(mapping)
+
+        # accumulate the reduced model in a flat store of sorted integer keys
+        # so that D can be filled in one pass at the end. Terms that cancel
+        # to zero along the way stay in the store and are dropped only once,
+        # when D is filled.
+        terms = {}
+
+        # do the reductions. partners indexes the reduced and prioritized
+        # pairs by their first variable so that we can find them quickly.
+        reductions, partners = {}, {}
+        for p in pairs:
+            if len(p) == 2:
+                partners.setdefault(p[0], set()).add(p[1])
         for key, v in mapped_self.items():
-            # find a reduction if len(key) > deg
-            while len(key) > deg:
-                # find a variable pair in k that has already been reduced.
-                in_pairs, previously_used = False, False
-                best_pair = None, None
-                for i, x in enumerate(key[:-1]):
-                    for y in key[i+1:]:
-                        pair = x, y
-                        if pair in reductions:
-                            previously_used = True
-                            break
-                        # prioritize the pairs that the user picked.
-                        elif pair in pairs:
-                            in_pairs = True
-                            best_pair = None, pair
-                            break
-                        elif (best_pair[0] is None or
-                              pair_frequencies[pair] > best_pair[0]):
-                            best_pair = pair_frequencies[pair], pair
-                    if previously_used or in_pairs:
-                        break
-
-                if previously_used:
-                    # z is the ancilla variable for this reduction
-                    z = reductions[(x, y)]
-                else:
-                    # we haven't already reduced the
-                    # variable pair (x, y), so take the pair that has the
-                    # greatest frequency or that is in pairs.
-                    x, y = best_pair[1]
+            if len(key) <= deg:
+                terms[key] = terms.get(key, 0) + v
+                continue
+
+            # reduce a sorted working copy of the key in place and only
+            # build the final tuple once it is short enough.
+            buf = list(key)
+
+            # every reduction of this term is enforced with the same weight,
+            # so compute the penalty coefficients once up front.
+            lv = func_lam(v)
+            penalty = lv and (3 * lv, lv, -2 * lv)
+
+            while len(buf) > deg:
+                x, y = _reduction_pair(buf, partners, pair_frequencies)
+
+                # z is the ancilla variable for this reduction. The labels are
+                # nonnegative integers, so we key reductions by the single
+                # packed integer x << 32 | y rather than by a tuple.
+                packed = x << 32 | y
+                z = reductions.get(packed)
+                if z is None:
+                    # we haven't already reduced the variable pair (x, y)
                     z = ancilla
-                    reductions[(x, y)] = z
+                    reductions[packed] = z
+                    partners.setdefault(x, set()).add(y)
                     ancilla += 1
                     pair_frequencies[(x, z)] += 1
                     pair_frequencies[(y, z)] += 1
 
                 # note we add the constraint even if we've already added
-                # it before (if found is True). This is because if we use
-                # the reduction multiple times, we need to enforce it
+                # it before (if z was already in reductions). This is because
+                # if we use the reduction multiple times, we need to enforce it
                 # multiple times.
 
-                # enforce that z == x y
-                D += qv.PCBO().add_constraint_eq_AND(
-                    z, x, y, lam=func_lam(v)
-                )
+                # enforce that z == x y with the penalty
+                # lam * (3 z + x y - 2 x z - 2 y z), writing the terms straight
+                # into the store. Note that x < y < z, so the keys are sorted.
+                if penalty:
+                    a, b, c = penalty
+                    terms[(z,)] = terms.get((z,), 0) + a
+                    terms[(x, y)] = terms.get((x, y), 0) + b
+                    terms[(x, z)] = terms.get((x, z), 0) + c
+                    terms[(y, z)] = terms.get((y, z), 0) + c
+
+                # buf is sorted, but it is not necessarily the case that
+                # z > all of the other elements in buf. So remove x and y by
+                # bisection (y first, since it comes after x) and insert z in
+                # its sorted position.
+                del buf[bisect_left(buf, y)]
+                del buf[bisect_left(buf, x)]
+                insort(buf, z)
+
+                # keep the pair frequencies in line with the partially reduced
+                # model: the pairs of x and y with the rest of the key are
+                # gone and they are replaced by pairs with z.
+                pair_frequencies[(x, y)] -= 1
+                for i in buf:
+                    if i != z:
+                        pair_frequencies[(x, i) if x < i else (i, x)] -= 1
+                        pair_frequencies[(y, i) if y < i else (i, y)] -= 1
+                        pair_frequencies[(z, i) if z < i else (i, z)] += 1
+
+            key = tuple(buf)
+            terms[key] = terms.get(key, 0) + v
+
+        # every key in terms is already sorted and valid, so fill D directly
+        D._update_squashed(terms)
+
+    def _reduce_degree_cached(self, cls, deg, lam, pairs):
+        """_reduce_degree_cached.
+
+        Create a ``cls`` object and fill it with ``self._reduce_degree``. The
+        result of the most recent reduction is cached, so that calling this
+        again with the same arguments before ``self`` is modified does not redo
+        the reduction. Calls that do not reduce the degree share one more
+        entry. The cache is shared between the output types, so for example
+        ``to_qubo()``, ``to_pubo(2)`` and ``to_quso()`` only reduce once. The
+        spin outputs are converted from the reduced PUBO once and cached
+        alongside it. A callable ``lam`` may depend on outside state, so it is
+        never cached.
 
-                # key is sorted, but it is not necessarily the case that
-                # z > all of the other elements in key. So let's efficiently
-                # figure out where to put z (without calling sorted)
+        Parameters
+        ----------
+        cls : ``qubovert.utils.PUBOMatrix``, ``qubovert.utils.QUBOMatrix``,
+              ``qubovert.utils.PUSOMatrix``, or ``qubovert.utils.QUSOMatrix``.
+            The type of the object to return.
+        deg, lam, pairs : see ``_reduce_degree``.
 
-                old_key, key, z_inserted = key, (), False
-                for i in old_key:
-                    if i in (x, y):
-                        continue
-                    elif not z_inserted and z < i:
-                        key += (z, i)
-                        z_inserted = True
-                    else:
-                        key += (i,)
-                if not z_inserted:
-                    key += (z,)
+        Return
+        ------
+        D : ``cls`` object.
+            A new object that the caller is free to modify.
 
-            D[key] += v
+        """
+        key = None
+        if deg is None or deg >= max(2, self.degree):
+            # nothing is reduced, so lam and pairs are not used.
+            key = ()
+        elif not callable(lam):
+            try:
+                key = deg, type(lam), lam, frozenset(pairs or ())
+                hash(key)
+            except TypeError:
+                key = None
+
+        # each entry maps the boolean PUBOMatrix and any spin conversions
+        # that have been requested from it. only one reduction is kept, so
+        # that sweeping over lam or deg does not grow the cache.
+        entry = None
+        if key == ():
+            entry = self._cache.get(key)
+        elif key is not None:
+            cached = self._cache.get('reduced')
+            if cached is not None and cached[0] == key:
+                entry = cached[1]
+        if entry is None:
+            D = PUBOMatrix()
+            self._reduce_degree(D, deg, lam, pairs)
+            entry = {PUBOMatrix: D}
+            if key == ():
+                self._cache[key] = entry
+            elif key is not None:
+                self._cache['reduced'] = key, entry
+
+        if cls is QUSOMatrix:
+            if QUSOMatrix not in entry:
+                entry[QUSOMatrix] = qubo_to_quso(
+                    QUBOMatrix._from_squashed(entry[PUBOMatrix])
+                )
+            return cls._from_squashed(entry[QUSOMatrix])
+        elif cls is PUSOMatrix:
+            if PUSOMatrix not in entry:
+                entry[PUSOMatrix] = pubo_to_puso(entry[PUBOMatrix])
+            return cls._from_squashed(entry[PUSOMatrix])
+        return cls._from_squashed(entry[PUBOMatrix])
 
     def to_pubo(self, deg=None, lam=None, pairs=None):
         """to_pubo.
@@ -368,9 +518,7 @@ class PUBO(BO, PUBOMatrix):
         See https://arxiv.org/pdf/1307.8041.pdf equation 6.
 
         """
-        P = PUBOMatrix()
-        self._reduce_degree(P, deg, lam, pairs)
-        return P
+        return self._reduce_degree_cached(PUBOMatrix, deg, lam, pairs)
 
     def to_qubo(self, lam=None, pairs=None):
         """to_qubo.
@@ -379,7 +527,10 @@ class PUBO(BO, PUBOMatrix):
         The labels will be integers from 0 to n-1. We introduce ancilla
         variables in order to reduce the degree of the PUBO to a QUBO. The
         solution to the PUBO can be read from the solution to the QUBO by
-        using the ``convert_solution`` method.
+        using the ``convert_solution`` method. If your solver can handle
+        higher order terms, consider ``to_pubo(deg)`` with ``deg > 2``
+        instead, which stops the reduction at degree ``deg`` and so introduces
+        fewer ancillas and penalty terms.
 
         Parameters
         ----------
@@ -414,9 +565,53 @@ class PUBO(BO, PUBOMatrix):
             see ``help(qubovert.utils.QUBOMatrix)``.
 
         """
-        Q = QUBOMatrix()
-        self._reduce_degree(Q, 2, lam, pairs)
-        return Q
+        return self._reduce_degree_cached(QUBOMatrix, 2, lam, pairs)
+
+    def to_puso(self, deg=None, lam=None, pairs=None):
+        """to_puso.
+
+        Create and return PUSO model representing the problem. The degree of
+        the problem is reduced with ``to_pubo`` and the result is converted to
+        a PUSO. The reduction is shared with ``to_pubo``, so calling both with
+        the same arguments only reduces the degree once.
+
+        Parameters
+        ----------
+        deg, lam, pairs : see ``help(self.to_pubo)``.
+
+        Return
+        ------
+        H : qubovert.utils.PUSOMatrix object.
+            For most practical purposes, you can use PUSOMatrix in the
+            same way as an ordinary dictionary. For more information,
+            see ``help(qubovert.utils.PUSOMatrix)``.
+
+        """
+        return self._reduce_degree_cached(PUSOMatrix, deg, lam, pairs)
+
+    def to_quso(self, lam=None, pairs=None):
+        """to_quso.
+
+        Create and return QUSO model representing the problem. The degree of
+        the problem is reduced with ``to_qubo`` and the result is converted to
+        a QUSO. The reduction is shared with ``to_qubo``, so calling both with
+        the same arguments only reduces the degree once.
+
+        Parameters
+        ----------
+        lam, pairs : see ``help(self.to_qubo)``.
+
+        Return
+        ------
+        L : qubovert.utils.QUSOMatrix object.
+            The upper triangular coupling matrix, where two element tuples
+            represent couplings and one element tuples represent fields.
+            For most practical purposes, you can use QUSOMatrix in the
+            same way as an ordinary dictionary. For more information,
+            see ``help(qubovert.utils.QUSOMatrix)``.
+
+        """
+        return self._reduce_degree_cached(QUSOMatrix, 2, lam, pairs)
 
     def convert_solution(self, solution, spin=False):
         """convert_solution.
@@ -150,11 +150,14 @@ class PUSO(BO, PUSOMatrix):
             see ``help(qubovert.utils.PUSOMatrix)``.
 
         """
-        H = PUSOMatrix()
+        # the relabeled keys are sorted and valid, so accumulate them in a
+        # plain dict and fill H in one pass.
+        terms, mapping = {}, self._mapping
         for k, v in self.items():
-            key = tuple(sorted(self._mapping[i] for i in k))
-            H[key] += v
-        return H
+            key = tuple(sorted(map(mapping.__getitem__, k)))
+            terms[key] = terms.get(key, 0) + v
+
+        return PUSOMatrix._from_squashed(terms)
 
     def _create_pubo(self):
         """_create_pubo.
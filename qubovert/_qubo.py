@@ -19,7 +19,7 @@ Contains the QUBO class. See ``help(qubovert.QUBO)``.
 """
 
 from .utils import (
-    BO, QUBOMatrix, PUBOMatrix, is_solution_spin, spin_to_boolean
+    BO, QUBOMatrix, PUBOMatrix, PUSOMatrix, is_solution_spin, spin_to_boolean
 )
 
 
@@ -133,13 +133,16 @@ class QUBO(BO, QUBOMatrix):
             see ``help(qubovert.utils.QUBOMatrix)``.
 
         """
-        Q = QUBOMatrix()
-
+        # the relabeled keys are squashed once they are sorted, so accumulate
+        # them in a plain dict and fill Q in one pass.
+        terms, mapping = {}, self._mapping
         for k, v in self.items():
-            key = tuple(self._mapping[i] for i in k)
-            Q[key] += v
+            key = tuple(map(mapping.__getitem__, k))
+            if len(key) == 2 and key[0] > key[1]:
+                key = key[1], key[0]
+            terms[key] = terms.get(key, 0) + v
 
-        return Q
+        return QUBOMatrix._from_squashed(terms)
 
     def to_pubo(self):
         """to_pubo.
@@ -156,7 +159,29 @@ class QUBO(BO, QUBOMatrix):
             see ``help(qubovert.utils.PUBOMatrix)``.
 
         """
-        return PUBOMatrix(self.to_qubo())
+        # the keys of the quadratic model are already valid PUBOMatrix keys,
+        # so they can be copied over without going through __setitem__.
+        return PUBOMatrix._from_squashed(self.to_qubo())
+
+    def to_puso(self):
+        """to_puso.
+
+        Since the model is already degree two, ``self.to_puso`` will simply
+        return ``qubovert.utils.PUSOMatrix(self.to_quso())``. This avoids
+        the general PUBO to PUSO conversion.
+
+        Return
+        ------
+        H : qubovert.utils.PUSOMatrix object.
+            The upper triangular PUSO matrix, a PUSOMatrix object.
+            For most practical purposes, you can use PUSOMatrix in the
+            same way as an ordinary dictionary. For more information,
+            see ``help(qubovert.utils.PUSOMatrix)``.
+
+        """
+        # the keys of the quadratic model are already valid PUSOMatrix keys,
+        # so they can be copied over without going through __setitem__.
+        return PUSOMatrix._from_squashed(self.to_quso())
 
     def convert_solution(self, solution, spin=False):
         """convert_solution.
@@ -211,10 +236,11 @@ class QUBO(BO, QUBOMatrix):
         """
         if is_solution_spin(solution, spin):
             solution = spin_to_boolean(solution)
-        return {
-            self._reverse_mapping[i]: solution[i]
-            for i in range(self.num_binary_variables)
-        }
+        indices = range(self.num_binary_variables)
+        return dict(zip(
+            map(self._reverse_mapping.__getitem__, indices),
+            map(solution.__getitem__, indices)
+        ))
 
     @staticmethod
     def _check_key_valid(key):
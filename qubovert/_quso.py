@@ -19,7 +19,7 @@ Contains the QUSO class. See ``help(qubovert.QUSO)``.
 """
 
 from .utils import (
-    BO, QUSOMatrix, PUSOMatrix, is_solution_spin, boolean_to_spin
+    BO, QUSOMatrix, PUSOMatrix, PUBOMatrix, is_solution_spin, boolean_to_spin
 )
 
 
@@ -133,13 +133,16 @@ class QUSO(BO, QUSOMatrix):
             see ``help(qubovert.utils.QUSOMatrix)``.
 
         """
-        L = QUSOMatrix()
-
+        # the relabeled keys are squashed once they are sorted, so accumulate
+        # them in a plain dict and fill L in one pass.
+        terms, mapping = {}, self._mapping
         for k, v in self.items():
-            key = tuple(self._mapping[i] for i in k)
-            L[key] += v
+            key = tuple(map(mapping.__getitem__, k))
+            if len(key) == 2 and key[0] > key[1]:
+                key = key[1], key[0]
+            terms[key] = terms.get(key, 0) + v
 
-        return L
+        return QUSOMatrix._from_squashed(terms)
 
     def to_puso(self):
         """to_puso.
@@ -156,7 +159,29 @@ class QUSO(BO, QUSOMatrix):
             see ``help(qubovert.utils.PUSOMatrix)``.
 
         """
-        return PUSOMatrix(self.to_quso())
+        # the keys of the quadratic model are already valid PUSOMatrix keys,
+        # so they can be copied over without going through __setitem__.
+        return PUSOMatrix._from_squashed(self.to_quso())
+
+    def to_pubo(self):
+        """to_pubo.
+
+        Since the model is already degree two, ``self.to_pubo`` will simply
+        return ``qubovert.utils.PUBOMatrix(self.to_qubo())``. This avoids
+        the general PUSO to PUBO conversion.
+
+        Return
+        ------
+        P : qubovert.utils.PUBOMatrix object.
+            The upper triangular PUBO matrix, a PUBOMatrix object.
+            For most practical purposes, you can use PUBOMatrix in the
+            same way as an ordinary dictionary. For more information,
+            see ``help(qubovert.utils.PUBOMatrix)``.
+
+        """
+        # the keys of the quadratic model are already valid PUBOMatrix keys,
+        # so they can be copied over without going through __setitem__.
+        return PUBOMatrix._from_squashed(self.to_qubo())
 
     def convert_solution(self, solution, spin=True):
         """convert_solution.
@@ -211,10 +236,11 @@ class QUSO(BO, QUSOMatrix):
         """
         if not is_solution_spin(solution, spin):
             solution = boolean_to_spin(solution)
-        return {
-            self._reverse_mapping[i]: solution[i]
-            for i in range(self.num_binary_variables)
-        }
+        indices = range(self.num_binary_variables)
+        return dict(zip(
+            map(self._reverse_mapping.__getitem__, indices),
+            map(solution.__getitem__, indices)
+        ))
 
     @staticmethod
     def _check_key_valid(key):
@@ -19,7 +19,7 @@ the problem classes.
 
 """
 
-from qubovert.utils import Conversions, PUBOMatrix
+from qubovert.utils import Conversions, PUBOMatrix, PUSOMatrix
 
 
 __all__ = 'Problem',
@@ -264,4 +264,26 @@ class Problem(Conversions):
             see ``help(qubovert.utils.PUBOMatrix)``.
 
         """
-        return PUBOMatrix(self.to_qubo(*args, **kwargs))
+        # the keys of the quadratic model are already valid PUBOMatrix keys,
+        # so they can be copied over without going through __setitem__.
+        return PUBOMatrix._from_squashed(self.to_qubo(*args, **kwargs))
+
+    def to_puso(self, *args, **kwargs):
+        """to_puso.
+
+        Since the model is already degree two, ``self.to_puso`` will simply
+        return ``qubovert.utils.PUSOMatrix(self.to_quso(*args, **kwargs))``.
+        This avoids the general PUBO to PUSO conversion.
+
+        Return
+        ------
+        H : qubovert.utils.PUSOMatrix object.
+            The upper triangular PUSO matrix, a PUSOMatrix object.
+            For most practical purposes, you can use PUSOMatrix in the
+            same way as an ordinary dictionary. For more information,
+            see ``help(qubovert.utils.PUSOMatrix)``.
+
+        """
+        # the keys of the quadratic model are already valid PUSOMatrix keys,
+        # so they can be copied over without going through __setitem__.
+        return PUSOMatrix._from_squashed(self.to_quso(*args, **kwargs))
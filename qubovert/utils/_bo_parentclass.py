@@ -20,7 +20,8 @@ class for some Binary Optimization classes, such as ``qubovert.QUBO``,
 
 """
 
-from . import Conversions
+from itertools import chain
+from . import Conversions, PUSOMatrix, QUSOMatrix
 from ._dict_arithmetic import _generate_key_value_pairs
 
 
@@ -53,6 +54,28 @@ class BO(Conversions):
 
         """
         self._mapping, self._reverse_mapping, self._next_label = {}, {}, 0
+        # results of the enumerated conversions (see PUBO.to_pubo), and the
+        # packed terms for ``value``. Anything that changes the model or its
+        # mapping clears it.
+        self._cache = {}
+
+    def __copy__(self):
+        """__copy__.
+
+        Same as the default shallow copy made by ``copy.copy``, but the copy
+        gets its own empty cache, so that changing one of the two objects does
+        not leave stale cached results in the other.
+
+        Returns
+        -------
+        res : same type as ``self``.
+
+        """
+        res = self.__class__.__new__(self.__class__)
+        res.__dict__.update(self.__dict__)
+        res._cache = {}
+        dict.update(res, self)
+        return res
 
     @property
     def mapping(self):
@@ -172,6 +195,7 @@ class BO(Conversions):
         ``set_mapping`` and ``set_reverse_mapping``.
 
         """
+        self._cache.clear()
         self._mapping, self._reverse_mapping = {}, {}
         for k, v in _generate_key_value_pairs(*args, **kwargs):
             self._mapping[k] = v
@@ -196,6 +220,7 @@ class BO(Conversions):
         ``set_mapping`` and ``set_reverse_mapping``.
 
         """
+        self._cache.clear()
         self._mapping, self._reverse_mapping = {}, {}
         for k, v in _generate_key_value_pairs(*args, **kwargs):
             self._mapping[v] = k
@@ -216,14 +241,187 @@ class BO(Conversions):
             Value corresponding to the key.
 
         """
+        if self._cache:
+            self._cache.clear()
         super().__setitem__(key, value)
+        self._add_labels(key)
+
+    def _add_labels(self, key):
+        """_add_labels.
 
+        Map each variable in ``key`` that is not in the mapping yet to the next
+        integer label.
+
+        Parameters
+        ----------
+        key : tuple or iterable.
+            The variables to add to the mapping, in order.
+
+        """
         for i in key:
             if i not in self._mapping:
                 self._mapping[i] = self._next_label
                 self._reverse_mapping[self._next_label] = i
                 self._next_label += 1
 
+    def __imul__(self, other):
+        """__imul__.
+
+        Same as the ``__imul__`` method of the parent Matrix class, which
+        rebuilds ``self`` without going through ``__setitem__`` when ``other``
+        is a dict. The variables are then added to the mapping in the same
+        order that setting each product one at a time would add them.
+
+        Parameters
+        ----------
+        other : numeric or dict/DictArithmetic object.
+
+        Return
+        ------
+        d : same type as ``self``, self.
+
+        """
+        if not isinstance(other, dict):
+            return super().__imul__(other)
+
+        keys = tuple(self)
+        okeys = tuple(k if isinstance(k, tuple) else (k,) for k in other)
+        super().__imul__(other)
+
+        # the products are k0 + ko for each ko, then k1 + ko, and so on, so
+        # the variables first appear in the order k0, then every ko, then k1,
+        # k2, and so on.
+        if keys and okeys:
+            for key in chain(keys[:1], okeys, keys[1:]):
+                self._add_labels(key)
+        return self
+
+    def __delitem__(self, key):
+        """__delitem__.
+
+        Same as ``dict.__delitem__``, but clears the cached conversions.
+
+        Parameters
+        ----------
+        key : tuple.
+            Element of the dictionary to remove.
+
+        """
+        self._cache.clear()
+        super().__delitem__(key)
+
+    def _update_values(self, values):
+        """_update_values.
+
+        Same as ``DictArithmetic._update_values``, but clears the cached
+        conversions.
+
+        Parameters
+        ----------
+        values : dict.
+            Maps keys of ``self`` to their new values.
+
+        """
+        self._cache.clear()
+        super()._update_values(values)
+
+    def _add_squashed(self, terms, sign):
+        """_add_squashed.
+
+        Same as ``PUBOMatrix._add_squashed``, but clears the cached
+        conversions.
+
+        Parameters
+        ----------
+        terms : dict.
+            Maps squashed keys to their values.
+        sign : 1 or -1.
+            Whether to add or subtract ``terms``.
+
+        """
+        if terms:
+            self._cache.clear()
+        super()._add_squashed(terms, sign)
+
+    def pop(self, *args):
+        """pop.
+
+        Same as ``dict.pop``, but clears the cached conversions.
+
+        """
+        self._cache.clear()
+        return super().pop(*args)
+
+    def popitem(self):
+        """popitem.
+
+        Same as ``dict.popitem``, but clears the cached conversions.
+
+        """
+        self._cache.clear()
+        return super().popitem()
+
+    def _packed_terms(self):
+        """_packed_terms.
+
+        Return the variables of ``self`` and its terms packed into bitmasks,
+        where the bit ``1 << i`` in a mask means that the term contains the
+        ``i``th variable, or for spin models, that it contains it an odd
+        number of times. The result is cached until ``self`` is changed.
+
+        Returns
+        -------
+        res : tuple (labels, packed).
+            ``labels`` is a list of the variables. ``packed`` is a list of
+            tuples (mask, coefficient), in the same order as ``self.items()``.
+
+        """
+        res = self._cache.get('packed_terms')
+        if res is None:
+            spin = isinstance(self, PUSOMatrix)
+            index = {}
+            packed = []
+            for k, v in self.items():
+                m = 0
+                for i in k:
+                    b = 1 << index.setdefault(i, len(index))
+                    m = m ^ b if spin else m | b
+                packed.append((m, v))
+            res = self._cache['packed_terms'] = list(index), packed
+        return res
+
+    def value(self, x):
+        """value.
+
+        Find the value of ``self`` at the assignment ``x``. This is the same as
+        the ``value`` method of the parent Matrix class, but the terms are
+        evaluated as bitmasks, which are cached between calls. See the parent
+        Matrix class for the parameters and return value.
+
+        """
+        # the multiplications in quso_value can change the type of the value.
+        if isinstance(self, QUSOMatrix):
+            return super().value(x)
+
+        labels, packed = self._packed_terms()
+        spin = isinstance(self, PUSOMatrix)
+        a = 0
+        try:
+            for i, label in enumerate(labels):
+                if (x[label] == -1) if spin else x[label]:
+                    a |= 1 << i
+        except (KeyError, IndexError, TypeError):
+            # the parent method only fails if a missing variable is reached.
+            return super().value(x)
+
+        # the terms are added in the same order as the parent method, so the
+        # values are exactly the same.
+        if spin:
+            return sum(
+                -c if bin(a & m).count('1') & 1 else c for m, c in packed
+            )
+        return sum(c for m, c in packed if a & m == m)
+
     def to_enumerated(self):
         """to_enumerated.
 
@@ -19,6 +19,9 @@ problems, as well as various misc converters
 
 """
 
+from itertools import chain
+from operator import index, itemgetter
+import numpy as np
 from . import QUBOMatrix, QUSOMatrix, PUBOMatrix, PUSOMatrix
 # for QUBO, QUSO, PUBO, PUSO, can't import directly because it will cause
 # circular imports, so instead just import qubovert.
@@ -34,6 +37,192 @@ __all__ = (
 )
 
 
+def _accumulator():
+    """_accumulator.
+
+    Internal method to create a plain dict accumulator that gives the same
+    result as adding each contribution to a model with ``D[key] += value``,
+    without squashing the key or updating the model each time. Just like
+    ``__setitem__``, a key whose sum is zero is removed, and it goes back at
+    the end if it comes back, so the values, their types and the key order are
+    all the same. See ``_fill_squashed``.
+
+    Returns
+    -------
+    res : tuple (terms, touched, add).
+        terms : dict.
+            Maps each key to its current nonzero sum.
+        touched : dict.
+            Maps every key that was added to, in the order that they were first
+            added to, to whether its sum was ever nonzero.
+        add : function.
+            ``add(key, value)`` adds ``value`` to the sum of the squashed key
+            ``key``.
+
+    """
+    terms, touched = {}, {}
+    get = terms.get
+
+    def add(key, value):
+        value = get(key, 0) + value
+        if value:
+            terms[key] = value
+            touched[key] = True
+        else:
+            terms.pop(key, None)
+            touched.setdefault(key, False)
+
+    return terms, touched, add
+
+
+def _fill_squashed(output, terms, touched, labels=None):
+    """_fill_squashed.
+
+    Internal method to create an ``output`` object filled with the result of
+    an ``_accumulator``. It is the same as if every contribution was added to
+    the object one at a time. So the ``degree`` and ``variables`` count the
+    terms that canceled out, and the mapping of a ``BO`` object has the
+    variables of every key that was added to, in the order they were added.
+
+    Parameters
+    ----------
+    output : qubovert.utils.PUBOMatrix or subclass.
+        The type of the object to create.
+    terms, touched : dict.
+        See ``_accumulator``.
+    labels : iterable of tuples (optional, defaults to None).
+        The keys whose variables are added to the mapping of a ``BO`` object,
+        in order. If ``labels`` is None, then they are the keys of
+        ``touched``.
+
+    Returns
+    -------
+    D : ``output`` object.
+
+    """
+    if output in (QUBOMatrix, QUSOMatrix, PUBOMatrix, PUSOMatrix):
+        D = output._from_squashed(terms)
+    else:
+        D = output()
+        D._add_labels(chain.from_iterable(
+            touched if labels is None else labels
+        ))
+        D._update_squashed(terms)
+
+    nonzero = [k for k, v in touched.items() if v]
+    if nonzero:
+        D._degree = max(D._degree, max(map(len, nonzero)))
+        D._variables.update(chain.from_iterable(nonzero))
+        D._num_binary_variables = len(D._variables)
+    return D
+
+
+def _identity(key):
+    """_identity.
+
+    Internal method used as the ``squash_key`` of inputs whose keys are
+    already squashed.
+
+    Parameters
+    ----------
+    key : tuple.
+
+    Returns
+    -------
+    key : the same tuple.
+
+    """
+    return key
+
+
+def _dispatch(name, D):
+    """_dispatch.
+
+    Internal method to find how the conversion function ``name`` should treat
+    the input ``D``. The tables are filled on first use, because
+    ``qubovert.QUBO``, etc, cannot be imported when this module is loaded.
+    They are keyed by the exact type of ``D``, not by ``isinstance``, because
+    for example ``isinstance(QUBO, QUBOMatrix)`` is True.
+
+    Parameters
+    ----------
+    name : str.
+        One of ``'qubo_to_quso'``, ``'quso_to_qubo'``, ``'pubo_to_puso'``,
+        or ``'puso_to_pubo'``.
+    D : dict or qubovert.utils.PUBOMatrix object or subclass.
+        The input to the conversion.
+
+    Returns
+    -------
+    res : tuple (squash_key, output).
+        squash_key : function.
+            Squashes a key of ``D``. It is the identity function if the keys
+            of ``D`` are already squashed.
+        output : type.
+            The type of the object that the conversion returns.
+
+    """
+    if not _DISPATCH:
+        for n, matrix, bo, output_matrix, output_bo in (
+            ('qubo_to_quso', QUBOMatrix, qv.QUBO, QUSOMatrix, qv.QUSO),
+            ('quso_to_qubo', QUSOMatrix, qv.QUSO, QUBOMatrix, qv.QUBO),
+            ('pubo_to_puso', PUBOMatrix, qv.PUBO, PUSOMatrix, qv.PUSO),
+            ('puso_to_pubo', PUSOMatrix, qv.PUSO, PUBOMatrix, qv.PUBO)
+        ):
+            _DISPATCH[n] = {
+                matrix: (_identity, output_matrix),
+                bo: (_identity, output_bo),
+                None: (bo.squash_key, output_bo)
+            }
+    table = _DISPATCH[name]
+    return table.get(type(D), table[None])
+
+
+# maps the name of a conversion function to its table for _dispatch
+_DISPATCH = {}
+
+
+def _subset_getters(n):
+    """_subset_getters.
+
+    Internal method to get the functions that extract every subset of a key
+    of length ``n``. Calling the ``mask``th function on the key returns the
+    tuple of the elements of the key at the positions where ``mask`` has a
+    zero bit, so that the first subset is the key itself and the last one is
+    the empty tuple. The functions are built once per length and cached.
+
+    Parameters
+    ----------
+    n : int.
+        The length of the key.
+
+    Returns
+    -------
+    getters : list of callables.
+        Each callable maps a tuple of length ``n`` to one of its subsets.
+
+    """
+    getters = _SUBSET_GETTERS.get(n)
+    if getters is None:
+        getters = []
+        for mask in range(1 << n):
+            indices = [i for i in range(n) if not mask >> i & 1]
+            # itemgetter with a single index does not return a tuple, so use
+            # a slice for subsets with fewer than two elements.
+            if len(indices) > 1:
+                getters.append(itemgetter(*indices))
+            elif indices:
+                getters.append(itemgetter(slice(indices[0], indices[0] + 1)))
+            else:
+                getters.append(itemgetter(slice(0, 0)))
+        _SUBSET_GETTERS[n] = getters
+    return getters
+
+
+# maps the length of a key to the result of _subset_getters
+_SUBSET_GETTERS = {}
+
+
 def boolean_to_spin(x):
     """boolean_to_spin.
 
@@ -41,12 +230,12 @@ def boolean_to_spin(x):
 
     Parameters
     ----------
-    x : int, iterable of ints, or dict mapping labels to ints.
+    x : int, iterable of ints, numpy array, or dict mapping labels to ints.
         Each integer is either 0 or 1.
 
     Returns
     -------
-    z : int, iterable of ints, or dict mapping labels to ints.
+    z : int, iterable of ints, numpy array, or dict mapping labels to ints.
         Each integer is either 1 or -1.
 
     Example
@@ -62,6 +251,12 @@ def boolean_to_spin(x):
         return convert[x]
     elif isinstance(x, dict):
         return {k: convert[v] for k, v in x.items()}
+    elif isinstance(x, np.ndarray):
+        # convert the whole array at once
+        invalid = x[(x != 0) & (x != 1)]
+        if invalid.size:
+            raise KeyError(invalid[0])
+        return 1 - 2 * x.astype(int)
     return type(x)(convert[i] for i in x)
 
 
@@ -72,12 +267,12 @@ def spin_to_boolean(z):
 
     Parameters
     ----------
-    z : int, iterable of ints, or dict mapping labels to ints.
+    z : int, iterable of ints, numpy array, or dict mapping labels to ints.
         Each integer is either 1 or -1.
 
     Returns
     -------
-    x : int, iterable of ints, or dict mapping labels to ints.
+    x : int, iterable of ints, numpy array, or dict mapping labels to ints.
         Each integer is either 0 or 1.
 
     Example
@@ -93,6 +288,12 @@ def spin_to_boolean(z):
         return convert[z]
     elif isinstance(z, dict):
         return {k: convert[v] for k, v in z.items()}
+    elif isinstance(z, np.ndarray):
+        # convert the whole array at once
+        invalid = z[(z != 1) & (z != -1)]
+        if invalid.size:
+            raise KeyError(invalid[0])
+        return (1 - z.astype(int)) // 2
     return type(z)(convert[i] for i in z)
 
 
@@ -125,13 +326,16 @@ def decimal_to_boolean(d, num_bits=None):
     """
     if int(d) != d or d < 0:
         raise ValueError("``d`` must be an integer >- 0.")
-    b = bin(d)[2:]
-    lb = len(b)
+    # read the bits off with shifts rather than formatting and parsing a
+    # string. index(d) also handles numpy integers, which lack bit_length,
+    # and raises a TypeError for floats just like bin(d) did.
+    d = index(d)
+    lb = d.bit_length() or 1
     if num_bits is None:
         num_bits = lb
     elif num_bits < lb:
         raise ValueError("Not enough bits to represent the number.")
-    return (0,) * (num_bits - lb) + tuple(int(x) for x in b)
+    return tuple([d >> i & 1 for i in range(num_bits - 1, -1, -1)])
 
 
 def boolean_to_decimal(b):
@@ -249,31 +453,26 @@ def qubo_to_quso(Q):
     # time converting from a PUSOMatrix to QUSOMatrix, so instead we
     # explictly write out the conversion.
 
-    # not isinstance! because isinstance(QUBO, QUBOMatrix) is True
-    if type(Q) in (QUBOMatrix, qv.QUBO):
-        # key will already be squashed
-        def squash_key(k): return k
-    else:
-        squash_key = qv.QUBO.squash_key
-
-    L = QUSOMatrix() if type(Q) == QUBOMatrix else qv.QUSO()
+    squash_key, output = _dispatch('qubo_to_quso', Q)
 
+    # accumulate in a plain dict, and then fill L once at the end.
+    terms, touched, add = _accumulator()
     for kp, v in Q.items():
         k = squash_key(kp)
         if not k:
-            L[k] += v
+            add(k, v)
         elif len(k) == 1:
-            L[k] -= v / 2
-            L[()] += v / 2
+            add(k, -v / 2)
+            add((), v / 2)
         else:
             # len(k) must be 2 because of squash_key
             i, j = k
-            L[k] += v / 4
-            L[(i,)] -= v / 4
-            L[(j,)] -= v / 4
-            L[()] += v / 4
+            add(k, v / 4)
+            add((i,), -v / 4)
+            add((j,), -v / 4)
+            add((), v / 4)
 
-    return L
+    return _fill_squashed(output, terms, touched)
 
 
 def quso_to_qubo(L):
@@ -315,31 +514,26 @@ def quso_to_qubo(L):
     # time converting from a PUBOMatrix to QUBOMatrix, so instead we explictly
     # write out the conversion.
 
-    # not isinstance! because isinstance(QUSO, QUSOMatrix) is True
-    if type(L) in (QUSOMatrix, qv.QUSO):
-        # key will already be squashed
-        def squash_key(k): return k
-    else:
-        squash_key = qv.QUSO.squash_key
-
-    Q = QUBOMatrix() if type(L) == QUSOMatrix else qv.QUBO()
+    squash_key, output = _dispatch('quso_to_qubo', L)
 
+    # accumulate in a plain dict, and then fill Q once at the end.
+    terms, touched, add = _accumulator()
     for kp, v in L.items():
         k = squash_key(kp)
         if not k:
-            Q[k] += v
+            add(k, v)
         elif len(k) == 1:
-            Q[k] -= 2 * v
-            Q[()] += v
+            add(k, -2 * v)
+            add((), v)
         else:
             # len(k) must be 2 because of squash_key
             i, j = k
-            Q[k] += 4 * v
-            Q[(i,)] -= 2 * v
-            Q[(j,)] -= 2 * v
-            Q[()] += v
+            add(k, 4 * v)
+            add((i,), -2 * v)
+            add((j,), -2 * v)
+            add((), v)
 
-    return Q
+    return _fill_squashed(output, terms, touched)
 
 
 def pubo_to_puso(P):
@@ -379,7 +573,7 @@ def pubo_to_puso(P):
     def generate_new_key_value(k):
         """generate_new_key_value.
 
-        Recursively generate the PUBO key, value pairs for converting the
+        Generate the PUBO key, value pairs for converting the
         product ``x[k[0]] * ... * x[k[-1]]``, where each ``x`` is a boolean
         variable in {0, 1}, to the product
         ``(1-z[k[0]])/2 * ... * (1-z[k[1]])/2``., where each ``z`` is a spin
@@ -390,30 +584,50 @@ def pubo_to_puso(P):
         k : tuple.
             Each element of the tuple corresponds to a boolean label.
 
-        Yields
-        ------
-        res : tuple (key, value)
+        Returns
+        -------
+        res : iterable of tuples (key, value)
             key : tuple.
                 Each element of the tuple corresponds to a spin label.
             value : float.
                 The value to multiply the value corresponding with ``k`` by.
 
         """
-        if not k:
-            yield k, 1
-        else:
-            for key, value in generate_new_key_value(k[1:]):
-                yield (k[0],) + key, -value / 2
-                yield key, value / 2
-
-    # not isinstance! because isinstance(PUBO, PUBOMatrix) is True
-    H = PUSOMatrix() if type(P) == PUBOMatrix else qv.PUSO()
-
+        # expand the product one factor at a time rather than recursing once
+        # per factor. Both the subsets and the values only depend on the
+        # number of factors, so they are computed once per degree.
+        keys = [get(k) for get in _subset_getters(len(k))]
+
+        values = value_table.get(len(k))
+        if values is None:
+            values = [1]
+            for _ in k:
+                values = [
+                    x for value in values for x in (-value / 2, value / 2)
+                ]
+            value_table[len(k)] = values
+
+        return zip(keys, values)
+
+    # maps the length of a key to the values from generate_new_key_value
+    value_table = {}
+
+    squash_key, output = _dispatch('pubo_to_puso', P)
+
+    # the subsets of a squashed key are squashed PUSO keys. Other keys are
+    # expanded as they are, and each subset is squashed as an output key.
+    if squash_key is not _identity:
+        squash_key = output.squash_key
+
+    # accumulate every contribution in a plain dict and fill H once.
+    terms, touched, add = _accumulator()
     for k, v in P.items():
         for key, value in generate_new_key_value(k):
-            H[key] += value * v
+            add(squash_key(key), value * v)
 
-    return H
+    # the first subset of each key is the key itself, before it is squashed,
+    # so the mapping is made from the keys of P.
+    return _fill_squashed(output, terms, touched, P)
 
 
 def puso_to_pubo(H):
@@ -453,7 +667,7 @@ def puso_to_pubo(H):
     def generate_new_key_value(k):
         """generate_new_key_value.
 
-        Recursively generate the PUBO key, value pairs for converting the
+        Generate the PUBO key, value pairs for converting the
         product ``z[k[0]] * ... * z[k[-1]]``, where each ``z`` is a spin in
         {1, -1}, to the product ``(1-2*x[k[0]]) * ... * (1-2*x[k[1]])``, where
         each ``x`` is a boolean variables in {0, 1}.
@@ -463,30 +677,48 @@ def puso_to_pubo(H):
         k : tuple.
             Each element of the tuple corresponds to a spin label.
 
-        Yields
-        ------
-        res : tuple (key, value)
+        Returns
+        -------
+        res : iterable of tuples (key, value)
             key : tuple.
                 Each element of the tuple corresponds to a binary label.
-            value : float.
+            value : int.
                 The value to multiply the value corresponding with ``k`` by.
 
         """
-        if not k:
-            yield k, 1
-        else:
-            for key, value in generate_new_key_value(k[1:]):
-                yield (k[0],) + key, -2 * value
-                yield key, value
+        # expand the product one factor at a time rather than recursing once
+        # per factor. Both the subsets and the values only depend on the
+        # number of factors, so they are computed once per degree.
+        keys = [get(k) for get in _subset_getters(len(k))]
+
+        values = value_table.get(len(k))
+        if values is None:
+            values = [1]
+            for _ in k:
+                values = [x for value in values for x in (-2 * value, value)]
+            value_table[len(k)] = values
+
+        return zip(keys, values)
+
+    # maps the length of a key to the values from generate_new_key_value
+    value_table = {}
+
+    squash_key, output = _dispatch('puso_to_pubo', H)
 
-    # not isinstance! because isinstance(PUSO, PUSOMatrix) is True
-    P = PUBOMatrix() if type(H) == PUSOMatrix else qv.PUBO()
+    # the subsets of a squashed key are squashed PUBO keys. Other keys are
+    # expanded as they are, and each subset is squashed as an output key.
+    if squash_key is not _identity:
+        squash_key = output.squash_key
 
+    # accumulate every contribution in a plain dict and fill P once.
+    terms, touched, add = _accumulator()
     for k, v in H.items():
         for key, value in generate_new_key_value(k):
-            P[key] += value * v
+            add(squash_key(key), value * v)
 
-    return P
+    # the first subset of each key is the key itself, before it is squashed,
+    # so the mapping is made from the keys of H.
+    return _fill_squashed(output, terms, touched, H)
 
 
 class Conversions:
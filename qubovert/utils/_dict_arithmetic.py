@@ -53,6 +53,49 @@ def _generate_key_value_pairs(*args, **kwargs):
     yield from k_v_pairs
 
 
+def _xreplace_rule(args, kwargs):
+    """_xreplace_rule.
+
+    Find the rule for ``xreplace`` that is equivalent to calling ``subs`` with
+    ``args`` and ``kwargs``. ``subs`` matches its keys against subexpressions
+    and substitutes them one after the other, whereas ``xreplace`` only
+    replaces exact matches, all at once. They are equivalent when every key is
+    a symbol and no value contains any of the keys.
+
+    Parameters
+    ----------
+    args : tuple.
+        The positional arguments to ``subs``.
+    kwargs : dict.
+        The keyword arguments to ``subs``.
+
+    Returns
+    -------
+    rule : dict or None.
+        Maps the symbols to their values. None if ``subs`` must be used.
+
+    """
+    if kwargs:
+        return None
+    elif len(args) == 2:
+        rule = {args[0]: args[1]}
+    elif len(args) == 1 and isinstance(args[0], dict):
+        rule = args[0]
+    else:
+        return None
+
+    for k, v in rule.items():
+        if not getattr(k, 'is_Symbol', False):
+            return None
+        elif hasattr(v, 'free_symbols'):
+            if not v.free_symbols.isdisjoint(rule):
+                return None
+        elif not isinstance(v, (int, float)):
+            # subs converts the other types, such as strings, to sympy.
+            return None
+    return rule
+
+
 class DictArithmetic(dict):
     """DictArithmetic.
 
@@ -256,6 +299,30 @@ class DictArithmetic(dict):
         else:
             self.pop(key, 0)
 
+    def _update_values(self, values):
+        """_update_values.
+
+        Internal method to replace the values of keys that are already in
+        ``self`` in a single pass, without calling ``__setitem__`` for each
+        one. Just like with ``__setitem__``, keys whose new value is zero are
+        removed. Subclasses that derive state from the values must override
+        this method, see ``qubovert.utils.BO``.
+
+        Parameters
+        ----------
+        values : dict.
+            Maps keys of ``self`` to their new values.
+
+        """
+        if all(values.values()):
+            dict.update(self, values)
+        else:
+            for k, v in values.items():
+                if v:
+                    dict.__setitem__(self, k, v)
+                else:
+                    dict.__delitem__(self, k)
+
     @property
     def num_terms(self):
         """num_terms.
@@ -565,8 +632,7 @@ class DictArithmetic(dict):
                     self[kp + kop] += v * vo
 
         else:
-            for k in tuple(self.keys()):
-                self[k] *= other
+            self._update_values({k: v * other for k, v in self.items()})
 
         return self
 
@@ -611,10 +677,21 @@ class DictArithmetic(dict):
         if not isinstance(exponent, int) or exponent <= 0:
             raise ValueError("Exponent must be a positive integer")
 
+        # for int coefficients, square for each bit of the exponent after the
+        # leading one, and multiply by the original when the bit is set. So
+        # for example ``self ** 4 == (self * self) * (self * self)`` takes two
+        # products instead of three. Other coefficients are multiplied in
+        # order, since regrouping the products can change how floats round.
         if exponent > 1:
             old = self.copy()
-            for _ in range(exponent-1):
-                self *= old
+            if all(type(v) == int for v in old.values()):
+                for bit in bin(exponent)[3:]:
+                    self *= self.copy()
+                    if bit == '1':
+                        self *= old
+            else:
+                for _ in range(exponent-1):
+                    self *= old
 
         return self
 
@@ -663,8 +740,7 @@ class DictArithmetic(dict):
         {(0, 0): .5, (0, 1): -.5}
 
         """
-        for k in tuple(self.keys()):
-            self[k] /= other
+        self._update_values({k: v / other for k, v in self.items()})
         return self
 
     def __floordiv__(self, other):
@@ -712,8 +788,7 @@ class DictArithmetic(dict):
         {(0, 0): 1, (0, 1): 0}
 
         """
-        for k in tuple(self.keys()):
-            self[k] //= other
+        self._update_values({k: v // other for k, v in self.items()})
         return self
 
     def __pos__(self):
@@ -782,8 +857,7 @@ class DictArithmetic(dict):
         """
         if self:
             mult = value / max(abs(v) for v in self.values())
-            for k in self:
-                self[k] *= mult
+            self._update_values({k: v * mult for k, v in self.items()})
 
     def subgraph(self, nodes, connections=None):
         """subgraph.
@@ -930,7 +1004,23 @@ class DictArithmetic(dict):
         """
         d = self.__class__()
 
+        # xreplace skips the pattern matching that subs does, so use it when
+        # it gives the same result.
+        rule = _xreplace_rule(args, kwargs)
+
         for k, v in self.items():
+            if rule is not None and hasattr(v, 'xreplace'):
+                val = v.xreplace(rule)
+                # if ``v`` is a key of ``rule``, then ``val`` is its value,
+                # which subs would have converted to sympy.
+                if hasattr(val, 'free_symbols'):
+                    try:
+                        val = float(val)
+                    except TypeError:
+                        pass
+                    d[k] = val
+                    continue
+
             try:
                 val = float(v.subs(*args, **kwargs))
             except AttributeError:
@@ -977,26 +1067,29 @@ class DictArithmetic(dict):
         """
         if not any(x for x in self.values()):
             return '0'
-        res, first = "", True
+        # build a list of the pieces and join them at the end, rather than
+        # concatenating, which copies the whole string for each piece. The
+        # last piece is always the "+ " after the previous term, so a negative
+        # coefficient replaces it with "- ".
+        res, first = [], True
         for prod, coef in self.items():
             try:
                 if coef > 0 and (coef != 1 or not prod):
-                    res += "%s " % coef
+                    res.append("%s " % coef)
                 elif coef < 0:
                     if coef == -1:
                         if first:
-                            res += "-" if prod else "-1 "
+                            res.append("-" if prod else "-1 ")
                         else:
-                            res = res[:-2] + ('- ' if prod else "- 1 ")
+                            res[-1] = '- ' if prod else "- 1 "
                     else:
                         if first:
-                            res += "%s " % coef
+                            res.append("%s " % coef)
                         else:
-                            res = res[:-2] + '- %s ' % abs(coef)
+                            res[-1] = '- %s ' % abs(coef)
             except TypeError:  # coef must be sympy symbolic
-                res += "(%s) " % str(coef)
-            for x in prod:
-                res += "%s(%s) " % (var_prefix, x)
-            res += "+ "
+                res.append("(%s) " % str(coef))
+            res.extend("%s(%s) " % (var_prefix, x) for x in prod)
+            res.append("+ ")
             first = False
-        return res[:-2].strip()
+        return "".join(res)[:-2].strip()
@@ -18,10 +18,12 @@ This file contains the PUBOMatrix object.
 
 """
 
+from itertools import chain
 from . import (
     DictArithmetic, ordering_key,
     pubo_value, solve_pubo_bruteforce
 )
+from ._dict_arithmetic import _generate_key_value_pairs
 
 
 __all__ = 'PUBOMatrix',
@@ -146,7 +148,54 @@ class PUBOMatrix(DictArithmetic):
         """
         self._degree = -float("inf")
         self._variables, self._num_binary_variables = set(), 0
-        super().__init__(*args, **kwargs)
+        super().__init__()
+
+        # a model of the same type is already squashed, so copy it directly.
+        if (
+            len(args) == 1 and not kwargs and args[0] and
+            type(args[0]) == type(self) and all(args[0].values())
+        ):
+            self._add_labels(chain.from_iterable(args[0]))
+            self._update_squashed(args[0])
+            return
+
+        # otherwise, accumulate the terms in a plain dict instead of calling
+        # ``self[key] += value`` for each one. The result is the same,
+        # including the key order when terms cancel and the ``degree`` and
+        # ``variables``, which count terms that cancel later.
+        squash = self.__class__.squash_key
+        terms, nonzero = {}, set()
+        for key, value in _generate_key_value_pairs(*args, **kwargs):
+            k = squash(key)
+            self._add_labels(key)
+            value = terms.get(k, 0) + value
+            if value:
+                terms[k] = value
+                nonzero.add(k)
+            else:
+                terms.pop(k, None)
+
+        dict.update(self, terms)
+        if nonzero:
+            self._degree = max(map(len, nonzero))
+            self._variables.update(chain.from_iterable(nonzero))
+            self._num_binary_variables = len(self._variables)
+
+    def _add_labels(self, key):
+        """_add_labels.
+
+        Internal method that is called with each key that is added to
+        ``self``, or with the variables of many keys at once. It does nothing
+        here, but subclasses such as ``BO`` use it to map the variables to
+        integer labels.
+
+        Parameters
+        ----------
+        key : tuple or iterable.
+            The key that is added, before it is squashed, or the variables of
+            several keys in order.
+
+        """
 
     def refresh(self):
         """refresh.
@@ -204,6 +253,173 @@ class PUBOMatrix(DictArithmetic):
         super().clear()
         self.__init__()
 
+    def __iadd__(self, other):
+        """__iadd__.
+
+        Same as ``DictArithmetic.__iadd__``. When ``other`` is the same type
+        as ``self``, its keys are already squashed, so they are added with
+        ``_add_squashed`` instead of through ``__getitem__`` and
+        ``__setitem__``.
+
+        Parameters
+        ----------
+        other : a DictArithmetic or dict object, or number.
+
+        Return
+        ------
+        d : same type as ``self``, self.
+
+        """
+        if type(other) == type(self):
+            self._add_squashed(other, 1)
+            return self
+        return super().__iadd__(other)
+
+    def __isub__(self, other):
+        """__isub__.
+
+        Same as ``DictArithmetic.__isub__``. When ``other`` is the same type
+        as ``self``, its keys are subtracted with ``_add_squashed``, see
+        ``__iadd__``.
+
+        Parameters
+        ----------
+        other : a DictArithmetic or dict object, or number.
+
+        Return
+        ------
+        d : same type as ``self``, self.
+
+        """
+        if type(other) == type(self):
+            self._add_squashed(other, -1)
+            return self
+        return super().__isub__(other)
+
+    def _add_squashed(self, terms, sign):
+        """_add_squashed.
+
+        Internal method to add ``sign`` times ``terms`` to ``self`` in place.
+        The keys of ``terms`` must already be squashed and valid, so the per
+        key checks in ``__getitem__`` and ``__setitem__`` are skipped. The
+        result, including the key order and the ``degree`` and ``variables``,
+        is the same as adding each term one at a time.
+
+        Parameters
+        ----------
+        terms : dict.
+            Maps squashed keys to their values.
+        sign : 1 or -1.
+            Whether to add or subtract ``terms``.
+
+        """
+        get, nonzero = self.get, []
+        items = list(terms.items()) if terms is self else terms.items()
+        for k, v in items:
+            value = get(k, 0) + v if sign > 0 else get(k, 0) - v
+            if value:
+                dict.__setitem__(self, k, value)
+                nonzero.append(k)
+            else:
+                dict.pop(self, k, None)
+
+        if nonzero:
+            self._degree = max(self._degree, max(map(len, nonzero)))
+            self._variables.update(chain.from_iterable(nonzero))
+            self._num_binary_variables = len(self._variables)
+        self._add_labels(chain.from_iterable(terms))
+
+    def __imul__(self, other):
+        """__imul__.
+
+        Same as ``DictArithmetic.__imul__``. When ``other`` is a dict, the
+        keys are packed into int bitmasks, so that each product is a single
+        int operation, and the products are accumulated in a plain dict keyed
+        by the masks. Each distinct product is squashed once and
+        ``__setitem__`` is skipped. The result, including the key order and
+        the ``degree`` and ``variables``, is the same as setting each product
+        one at a time.
+
+        Parameters
+        ----------
+        other : numeric or dict/DictArithmetic object.
+
+        Return
+        ------
+        d : same type as ``self``, self.
+
+        """
+        if not isinstance(other, dict):
+            return super().__imul__(other)
+
+        squash, combine = self.__class__.squash_key, self._combine_masks
+        bits = {}
+
+        def pack(key):
+            m = 0
+            for i in key:
+                b = bits.get(i)
+                if b is None:
+                    b = bits[i] = 1 << len(bits)
+                m = combine(m, b)
+            return m
+
+        items = [(pack(k), k, v) for k, v in self.items()]
+        oitems = []
+        for ko, vo in other.items():
+            ko = ko if isinstance(ko, tuple) else (ko,)
+            oitems.append((pack(ko), ko, vo))
+
+        # keys maps each product mask to its squashed key. Every product is
+        # squashed, even if its value is zero, so that invalid keys raise.
+        # nonzero has every mask that had a nonzero value at some point, since
+        # __setitem__ counts their variables even if the term cancels later.
+        terms, keys, nonzero = {}, {}, set()
+        for a, k, v in items:
+            for b, ko, vo in oitems:
+                m = combine(a, b)
+                if m not in keys:
+                    keys[m] = squash(k + ko)
+                value = terms.get(m, 0) + v * vo
+                if value:
+                    terms[m] = value
+                    nonzero.add(m)
+                else:
+                    # a cancelled term is reinserted at the end if it comes
+                    # back, just like when it is removed from self.
+                    terms.pop(m, None)
+
+        self.clear()
+        dict.update(self, {keys[m]: v for m, v in terms.items()})
+        if nonzero:
+            self._degree = max(len(keys[m]) for m in nonzero)
+            self._variables.update(
+                chain.from_iterable(keys[m] for m in nonzero)
+            )
+            self._num_binary_variables = len(self._variables)
+        return self
+
+    @staticmethod
+    def _combine_masks(a, b):
+        """_combine_masks.
+
+        Internal method to combine two keys that are packed into bitmasks, see
+        ``__imul__``. A repeated boolean variable is the same as the variable,
+        so the masks are or'ed.
+
+        Parameters
+        ----------
+        a, b : int.
+            Bitmasks of keys.
+
+        Returns
+        -------
+        m : int.
+            The bitmask of the product of the keys.
+
+        """
+        return a | b
+
     @property
     def degree(self):
         """degree.
@@ -304,9 +520,20 @@ class PUBOMatrix(DictArithmetic):
         """
         # if f is not None, then it is the squashed key (see QUBOMatrix)
         f = cls._check_key_valid(key)
-        # use ordering_key here because in subclasses x may not always
-        # be an int.
-        return f or tuple(sorted(set(key), key=ordering_key))
+        if f:
+            return f
+        # most keys are tiny, so handle them without building a set and
+        # sorting. use ordering_key here because in subclasses x may not
+        # always be an int.
+        n = len(key)
+        if n < 2:
+            return key
+        elif n == 2:
+            a, b = key
+            if a == b:
+                return a,
+            return key if ordering_key(a) < ordering_key(b) else (b, a)
+        return tuple(sorted(set(key), key=ordering_key))
 
     @staticmethod
     def _check_key_valid(key):
@@ -385,6 +612,58 @@ class PUBOMatrix(DictArithmetic):
                 self._num_binary_variables += 1
         super().__setitem__(k, value)
 
+    def _update_squashed(self, terms):
+        """_update_squashed.
+
+        Internal method to fill ``self`` from ``terms`` in a single pass. The
+        per key checks in ``__setitem__`` are skipped, so the caller must make
+        sure that every key of ``terms`` is valid and already equal to
+        ``self.squash_key(key)``, and that no two keys squash to the same key.
+        Nothing checks this, and a key that breaks it corrupts ``self``. Terms
+        with zero value are dropped. ``self`` should be empty to start.
+
+        Parameters
+        ----------
+        terms : dict.
+            Maps squashed keys to their values.
+
+        """
+        # dict.update sizes the table for all of the terms up front instead
+        # of growing it one insertion at a time.
+        if all(terms.values()):
+            dict.update(self, terms)
+        else:
+            dict.update(self, {k: v for k, v in terms.items() if v})
+        self._degree = max(chain((self._degree,), map(len, self)))
+        self._variables.update(chain.from_iterable(self))
+        self._num_binary_variables = len(self._variables)
+
+    @classmethod
+    def _from_squashed(cls, terms):
+        """_from_squashed.
+
+        Internal method to create a new object filled with ``terms``, whose
+        keys must already be squashed and valid. See ``_update_squashed``.
+        ``__init__`` is skipped, since there is nothing in it to do for an
+        empty matrix, so this should not be used for ``BO`` subclasses, which
+        need their mapping to be set up.
+
+        Parameters
+        ----------
+        terms : dict.
+            Maps squashed keys to their values.
+
+        Returns
+        -------
+        D : same type as ``cls``.
+
+        """
+        D = cls.__new__(cls)
+        D._name, D._degree = None, -float("inf")
+        D._variables, D._num_binary_variables = set(), 0
+        D._update_squashed(terms)
+        return D
+
     def is_solution_valid(self, solution):
         """is_solution_valid.
 
@@ -423,8 +702,33 @@ class PUBOMatrix(DictArithmetic):
             ``qubovert.utils.solve_pubo_bruteforce``.
 
         """
-        return solve_pubo_bruteforce(self,
-                                     all_solutions, self.is_solution_valid)[1]
+        return self._solve_bruteforce(solve_pubo_bruteforce, all_solutions)
+
+    def _solve_bruteforce(self, solver, all_solutions):
+        """_solve_bruteforce.
+
+        Call the bruteforce ``solver`` on ``self`` with
+        ``self.is_solution_valid``. If ``is_solution_valid`` is not overridden,
+        then every solution is valid, so it is not passed to ``solver`` and no
+        solution has to be checked.
+
+        Parameters
+        ----------
+        solver : function.
+            One of the bruteforce solvers in ``qubovert.utils``.
+        all_solutions : bool.
+            See the description of the ``all_solutions`` parameter in
+            ``qubovert.utils.solve_pubo_bruteforce``.
+
+        Return
+        ------
+        res : the second element of the two element tuple that is returned from
+            ``solver``.
+
+        """
+        if type(self).is_solution_valid is PUBOMatrix.is_solution_valid:
+            return solver(self, all_solutions)[1]
+        return solver(self, all_solutions, self.is_solution_valid)[1]
 
     def value(self, x):
         r"""value.
@@ -157,12 +157,48 @@ class PUSOMatrix(PUBOMatrix):
         """
         # if f is not None, then it is the squashed key. See QUSOMatrix.
         f = cls._check_key_valid(key)
-        # use ordering_key here because in subclasses x may not always
-        # be an int.
-        return f or tuple(sorted(
-            (x for x in set(key) if key.count(x) % 2),
-            key=ordering_key
-        ))
+        if f:
+            return f
+        # most keys are tiny, so handle them without counting and sorting.
+        # use ordering_key here because in subclasses x may not always be an
+        # int.
+        n = len(key)
+        if n < 2:
+            return key
+        elif n == 2:
+            a, b = key
+            if a == b:
+                return ()
+            return key if ordering_key(a) < ordering_key(b) else (b, a)
+        # keep the variables that appear an odd number of times.
+        odd = set()
+        for x in key:
+            if x in odd:
+                odd.remove(x)
+            else:
+                odd.add(x)
+        return tuple(sorted(odd, key=ordering_key))
+
+    @staticmethod
+    def _combine_masks(a, b):
+        """_combine_masks.
+
+        Internal method to combine two keys that are packed into bitmasks, see
+        ``PUBOMatrix.__imul__``. A pair of the same spin variable is 1, so the
+        masks are xor'ed.
+
+        Parameters
+        ----------
+        a, b : int.
+            Bitmasks of keys.
+
+        Returns
+        -------
+        m : int.
+            The bitmask of the product of the keys.
+
+        """
+        return a ^ b
 
     def solve_bruteforce(self, all_solutions=False):
         """solve_bruteforce.
@@ -184,8 +220,7 @@ class PUSOMatrix(PUBOMatrix):
             ``qubovert.utils.solve_puso_bruteforce``.
 
         """
-        return solve_puso_bruteforce(self, all_solutions,
-                                     self.is_solution_valid)[1]
+        return self._solve_bruteforce(solve_puso_bruteforce, all_solutions)
 
     def value(self, z):
         r"""value.
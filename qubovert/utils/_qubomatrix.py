@@ -217,8 +217,7 @@ class QUBOMatrix(PUBOMatrix):
             ``qubovert.utils.solve_qubo_bruteforce``.
 
         """
-        return solve_qubo_bruteforce(self,
-                                     all_solutions, self.is_solution_valid)[1]
+        return self._solve_bruteforce(solve_qubo_bruteforce, all_solutions)
 
     @property
     def Q(self):
@@ -255,18 +254,25 @@ def matrix_to_qubo(matrix):
        ``help(qubovert.utils.QUBOMatrix)``.
 
     """
-    if not isinstance(matrix, np.ndarray):
-        matrix = np.array(matrix)
+    matrix = np.asarray(matrix)
 
     if len(matrix.shape) != 2 or matrix.shape[0] != matrix.shape[1]:
         raise ValueError("Input matrix must be square and two-dimensional")
 
-    Q = QUBOMatrix()
-    for i in range(matrix.shape[0]):
-        for j in range(matrix.shape[1]):
-            Q[(i, j)] += matrix[i][j]
+    # fold the lower triangle onto the upper triangle so that we only have
+    # to visit the nonzero entries once. The fold and the nonzero scan both
+    # run inside numpy, so building the dictionary is the only Python loop.
+    upper = np.triu(matrix) + np.tril(matrix, -1).T
+    rows, cols = np.nonzero(upper)
 
-    return Q
+    # tolist converts every entry to a Python number in one call, rather than
+    # creating a numpy scalar per element.
+    return QUBOMatrix._from_squashed({
+        (i,) if i == j else (i, j): v
+        for i, j, v in zip(
+            rows.tolist(), cols.tolist(), upper[rows, cols].tolist()
+        )
+    })
 
 
 def qubo_to_matrix(Q, symmetric=False, array=True):
@@ -307,17 +313,26 @@ def qubo_to_matrix(Q, symmetric=False, array=True):
         raise ValueError("QUBO cannot have a constant when converting "
                          "to a matrix")
 
-    matrix = np.zeros((Q.max_index+1,)*2)
+    # split the terms into the diagonal and the off diagonal, and then
+    # scatter each group into the matrix at once.
+    diag, diag_values, rows, cols, values = [], [], [], [], []
     for k, v in Q.items():
         if len(k) == 1:
-            matrix[k[0]][k[0]] = v
-        elif symmetric:
-            i, j = k
-            matrix[i][j] = v / 2
-            matrix[j][i] = v / 2
+            diag.append(k[0])
+            diag_values.append(v)
         else:
-            i, j = k
-            matrix[i][j] = v
+            rows.append(k[0])
+            cols.append(k[1])
+            values.append(v)
+
+    matrix = np.zeros((Q.max_index+1,)*2)
+    matrix[diag, diag] = diag_values
+    if symmetric:
+        values = np.array(values, dtype=float) / 2
+        matrix[rows, cols] = values
+        matrix[cols, rows] = values
+    else:
+        matrix[rows, cols] = values
 
     if not array:
         return matrix.tolist()
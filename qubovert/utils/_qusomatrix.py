@@ -207,8 +207,7 @@ class QUSOMatrix(PUSOMatrix):
             ``qubovert.utils.solve_quso_bruteforce``.
 
         """
-        return solve_quso_bruteforce(self, all_solutions,
-                                     self.is_solution_valid)[1]
+        return self._solve_bruteforce(solve_quso_bruteforce, all_solutions)
 
     @property
     def h(self):
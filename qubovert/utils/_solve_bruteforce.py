@@ -19,7 +19,7 @@ This file contains bruteforce solvers for QUBO/PUBO and QUSO/PUSO.
 """
 
 import itertools
-from . import pubo_value, puso_value, qubo_value, quso_value
+import numpy as np
 
 __all__ = (
     'solve_pubo_bruteforce', 'solve_qubo_bruteforce',
@@ -27,7 +27,71 @@ __all__ = (
 )
 
 
-def _solve_bruteforce(D, all_solutions, valid, spin, value):
+def _always_valid(x):
+    """_always_valid.
+
+    The default ``valid`` function for the bruteforce solvers.
+
+    Parameters
+    ----------
+    x : dict.
+        The solution to check.
+
+    Returns
+    -------
+    valid : bool.
+        Always returns True.
+
+    """
+    return True
+
+
+# the number of variables from which integer models are enumerated with numpy,
+# and the number of assignments that are evaluated at once.
+_VECTORIZE_MIN_VARIABLES = 8
+_VECTORIZE_CHUNK = 1 << 16
+
+
+def _packed_values(packed, start, stop, spin):
+    """_packed_values.
+
+    Evaluate a packed model on the assignments ``start`` through ``stop - 1``
+    with numpy. See ``_solve_bruteforce`` for how the model and assignments
+    are packed.
+
+    Parameters
+    ----------
+    packed : list of tuples (mask, coefficient).
+        The packed terms of the model. The coefficients must be floats that
+        are integers, with sums that are exact as floats.
+    start, stop : int.
+        The range of assignments to evaluate.
+    spin : bool.
+        Whether the model is a spin model or boolean model.
+
+    Returns
+    -------
+    values : numpy.ndarray.
+        ``values[i]`` is the value of the model at the assignment
+        ``start + i``. Every partial sum is an integer that is exact as a
+        float, so the values do not depend on the order of addition.
+
+    """
+    a = np.arange(start, stop, dtype=np.int64)
+    values = np.zeros(len(a))
+    for m, c in packed:
+        if spin:
+            # the parity of the bits of a & m, by folding it in half.
+            p = a & m
+            for shift in (32, 16, 8, 4, 2, 1):
+                p ^= p >> shift
+            values += np.where(p & 1, -c, c)
+        else:
+            values += np.where(a & m == m, c, 0.)
+    return values
+
+
+def _solve_bruteforce(D, all_solutions, valid, spin):
     """_solve_bruteforce.
 
     Helper function for solve_pubo_bruteforce, solve_puso_bruteforce,
@@ -51,9 +115,6 @@ def _solve_bruteforce(D, all_solutions, valid, spin, value):
         indicating whether that bitstring or spinstring is a valid solutions.
     spin : bool.
         Whether we're bruteforce solving a spin model or boolean model.
-    value : function.
-        One of ``qubo_value``, ``quso_value``, ``pubo_value``, or
-        ``puso_value``.
 
     Returns
     -------
@@ -99,19 +160,74 @@ def _solve_bruteforce(D, all_solutions, valid, spin, value):
         # map qubit name to 0 through N-1
         mapping = dict(enumerate(var))
 
+    labels = [mapping[i] for i in range(N)]
+    index = {label: i for i, label in enumerate(labels)}
+
+    # pack each term into a bitmask of its variables, with the first variable
+    # as the most significant bit. Then counting ``a`` from 0 to 2**N - 1
+    # enumerates the assignments in the same order as itertools.product, where
+    # a set bit means that the variable is 1 for boolean models and -1 for
+    # spin models. A repeated spin cancels since z**2 == 1.
+    packed = []
+    for k, v in D.items():
+        m = 0
+        for i in k:
+            if spin:
+                m ^= 1 << (N - 1 - index[i])
+            else:
+                m |= 1 << (N - 1 - index[i])
+        packed.append((m, v))
+
+    check = valid is not _always_valid
+
+    # integer models with enough variables are enumerated with numpy. The ints
+    # must be small enough that every partial sum is exact as a float. Float
+    # models are not, since numpy would round the sums differently than the
+    # python loop, which could change the best solutions.
+    if (
+        not check and N >= _VECTORIZE_MIN_VARIABLES and
+        set(map(type, D.values())) == {int} and
+        sum(map(abs, D.values())) < 1 << 53
+    ):
+        return _solve_bruteforce_vectorized(
+            packed, labels, all_solutions, spin
+        )
+
+    # integer models are exact under any order of addition, so they can be
+    # enumerated in Gray code order, updating the value one bit at a time.
+    if set(map(type, D.values())) == {int}:
+        return _solve_bruteforce_gray(
+            packed, labels, all_solutions, valid if check else None, spin
+        )
+
+    if spin:
+        # parity[a] is 1 if ``a`` has an odd number of set bits, in which case
+        # a term whose mask is ``a`` is negated.
+        parity = bytearray(1 << N)
+        for a in range(1, 1 << N):
+            parity[a] = parity[a >> 1] ^ (a & 1)
+
+    # the sums add the same values in the same order as the ``value``
+    # functions, so the objective values are exactly the same.
     best = None, {}
     all_sols = {None: [{}]}
 
-    for test_sol in itertools.product((1, -1) if spin else (0, 1), repeat=N):
-        x = {mapping[i]: v for i, v in enumerate(test_sol)}
-        if not valid(x):
-            continue
-        v = value(x, D)
+    for a, test_sol in enumerate(
+        itertools.product((1, -1) if spin else (0, 1), repeat=N)
+    ):
+        if check:
+            x = dict(zip(labels, test_sol))
+            if not valid(x):
+                continue
+        if spin:
+            v = sum([-c if parity[a & m] else c for m, c in packed])
+        else:
+            v = sum([c for m, c in packed if a & m == m])
         if all_solutions and (best[0] is None or v <= best[0]):
-            best = v, x
-            all_sols.setdefault(v, []).append(x)
+            best = v, x if check else dict(zip(labels, test_sol))
+            all_sols.setdefault(v, []).append(best[1])
         elif best[0] is None or v < best[0]:
-            best = v, x
+            best = v, x if check else dict(zip(labels, test_sol))
 
     if all_solutions:
         best = best[0], all_sols[best[0]]
@@ -119,7 +235,162 @@ def _solve_bruteforce(D, all_solutions, valid, spin, value):
     return best
 
 
-def solve_pubo_bruteforce(P, all_solutions=False, valid=lambda x: True):
+def _solve_bruteforce_vectorized(packed, labels, all_solutions, spin):
+    """_solve_bruteforce_vectorized.
+
+    Find the best solutions of a packed integer model like
+    ``_solve_bruteforce``, but evaluate the assignments in chunks with numpy.
+    The chunks are combined in order, so the same solutions are returned.
+
+    Parameters
+    ----------
+    packed : list of tuples (mask, coefficient).
+        The packed terms of the model. See ``_solve_bruteforce``.
+    labels : list.
+        ``labels[i]`` is the label of the variable whose bit is
+        ``1 << (len(labels) - 1 - i)``.
+    all_solutions : bool.
+        Whether to return all of the best solutions or just one.
+    spin : bool.
+        Whether the model is a spin model or boolean model.
+
+    Returns
+    -------
+    res : tuple (objective, solution).
+        See ``_solve_bruteforce``.
+
+    """
+    N = len(labels)
+    terms = [(m, float(c)) for m, c in packed]
+
+    best, best_assignments = None, []
+    for start in range(0, 1 << N, _VECTORIZE_CHUNK):
+        # the best value in the chunk of assignments starting at ``start``,
+        # and the assignments that give it.
+        values = _packed_values(
+            terms, start, min(start + _VECTORIZE_CHUNK, 1 << N), spin
+        )
+        v = values.min()
+        if all_solutions:
+            assignments = (np.flatnonzero(values == v) + start).tolist()
+        else:
+            assignments = [start + int(values.argmin())]
+
+        if best is None or v < best:
+            best, best_assignments = v, assignments
+        elif v == best and all_solutions:
+            best_assignments.extend(assignments)
+
+    # evaluate the objective in python, so that it has the same type as the
+    # value that ``_solve_bruteforce`` would return. That is the value at the
+    # last of the best solutions when they are all kept, and otherwise at
+    # the first.
+    a = best_assignments[-1]
+    if spin:
+        objective = sum([
+            -c if bin(a & m).count('1') & 1 else c for m, c in packed
+        ])
+    else:
+        objective = sum([c for m, c in packed if a & m == m])
+
+    values = (1, -1) if spin else (0, 1)
+    sols = [
+        {
+            label: values[a >> (N - 1 - i) & 1]
+            for i, label in enumerate(labels)
+        }
+        for a in best_assignments[:None if all_solutions else 1]
+    ]
+    return objective, sols if all_solutions else sols[0]
+
+
+def _solve_bruteforce_gray(packed, labels, all_solutions, valid, spin):
+    """_solve_bruteforce_gray.
+
+    Find the best solutions of a packed integer model like
+    ``_solve_bruteforce``, but visit the assignments in Gray code order so
+    that consecutive assignments differ in exactly one bit. The value is then
+    updated with only the terms that contain that bit. Ties are broken by the
+    order of ``_solve_bruteforce``, so the same solutions are returned.
+
+    Parameters
+    ----------
+    packed : list of tuples (mask, coefficient).
+        The packed terms of the model. See ``_solve_bruteforce``. The
+        coefficients must be ints.
+    labels : list.
+        ``labels[i]`` is the label of the variable whose bit is
+        ``1 << (len(labels) - 1 - i)``.
+    all_solutions : bool.
+        Whether to return all of the best solutions or just one.
+    valid : function or None.
+        ``valid`` takes in a bitstring or spinstring and outputs a boolean
+        indicating whether that bitstring or spinstring is a valid solutions.
+        If None, then every solution is valid.
+    spin : bool.
+        Whether the model is a spin model or boolean model.
+
+    Returns
+    -------
+    res : tuple (objective, solution).
+        See ``_solve_bruteforce``.
+
+    """
+    N = len(labels)
+    values = (1, -1) if spin else (0, 1)
+
+    def solution(a):
+        return {
+            label: values[a >> (N - 1 - i) & 1]
+            for i, label in enumerate(labels)
+        }
+
+    # terms[k] are the terms that contain bit k.
+    terms = [[(m, c) for m, c in packed if m >> k & 1] for k in range(N)]
+
+    # the value at the assignment 0, where every variable is 0 or 1.
+    a = 0
+    if spin:
+        v = sum(c for _, c in packed)
+    else:
+        v = sum(c for m, c in packed if not m)
+
+    best, best_assignments = None, []
+    for i in range(1, (1 << N) + 1):
+        if valid is None or valid(solution(a)):
+            if best is None or v < best:
+                best, best_assignments = v, [a]
+            elif v == best and all_solutions:
+                best_assignments.append(a)
+            elif v == best and a < best_assignments[0]:
+                best_assignments[0] = a
+
+        if i == 1 << N:
+            break
+        # the bit that changes between the Gray codes of i - 1 and i.
+        b = (i & -i).bit_length() - 1
+        bit = 1 << b
+        if spin:
+            for m, c in terms[b]:
+                v += 2 * c if bin(a & m).count('1') & 1 else -2 * c
+        elif a & bit:
+            for m, c in terms[b]:
+                if a & m == m:
+                    v -= c
+        else:
+            for m, c in terms[b]:
+                if (a | bit) & m == m:
+                    v += c
+        a ^= bit
+
+    if best is None:
+        return None, [{}] if all_solutions else {}
+
+    sols = [solution(a) for a in sorted(best_assignments)]
+    return best, sols if all_solutions else sols[0]
+
+
+def solve_pubo_bruteforce(P, all_solutions=False, valid=_always_valid):
     """solve_pubo_bruteforce.
 
     Iterate through all the possible solutions to a PUBO formulated problem
@@ -181,10 +452,10 @@ def solve_pubo_bruteforce(P, all_solutions=False, valid=lambda x: True):
     is 0, :math:`x_2` is 1.
 
     """
-    return _solve_bruteforce(P, all_solutions, valid, False, pubo_value)
+    return _solve_bruteforce(P, all_solutions, valid, False)
 
 
-def solve_qubo_bruteforce(Q, all_solutions=False, valid=lambda x: True):
+def solve_qubo_bruteforce(Q, all_solutions=False, valid=_always_valid):
     """solve_qubo_bruteforce.
 
     Iterate through all the possible solutions to a QUBO formulated problem
@@ -248,13 +519,10 @@ def solve_qubo_bruteforce(Q, all_solutions=False, valid=lambda x: True):
     is 0, :math:`x_2` is 1.
 
     """
-    # we could just do the same as we did in solve_pubo_bruteforce, but the
-    # qubo_value function is much faster than the pubo_value function, so this
-    # will be much faster!
-    return _solve_bruteforce(Q, all_solutions, valid, False, qubo_value)
+    return _solve_bruteforce(Q, all_solutions, valid, False)
 
 
-def solve_puso_bruteforce(H, all_solutions=False, valid=lambda x: True):
+def solve_puso_bruteforce(H, all_solutions=False, valid=_always_valid):
     """solve_puso_bruteforce.
 
     Iterate through all the possible solutions to an PUSO formulated problem
@@ -316,10 +584,10 @@ def solve_puso_bruteforce(H, all_solutions=False, valid=lambda x: True):
     is -1, :math:`z_2` is 1.
 
     """
-    return _solve_bruteforce(H, all_solutions, valid, True, puso_value)
+    return _solve_bruteforce(H, all_solutions, valid, True)
 
 
-def solve_quso_bruteforce(L, all_solutions=False, valid=lambda x: True):
+def solve_quso_bruteforce(L, all_solutions=False, valid=_always_valid):
     """solve_quso_bruteforce.
 
     Iterate through all the possible solutions to an QUSO formulated problem
@@ -381,7 +649,4 @@ def solve_quso_bruteforce(L, all_solutions=False, valid=lambda x: True):
     is -1, :math:`z_2` is 1.
 
     """
-    # we could just do the same as we did in solve_puso_bruteforce, but the
-    # quso_value function is much faster than the puso_value function, so this
-    # will be much faster!
-    return _solve_bruteforce(L, all_solutions, valid, True, quso_value)
+    return _solve_bruteforce(L, all_solutions, valid, True)
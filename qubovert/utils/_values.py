@@ -122,8 +122,9 @@ def puso_value(z, H):
     0
 
     """
+    # the sign of each term is the parity of the number of -1 spins in it.
     return sum(
-        v * pow(-1, [z[i] for i in k].count(-1) % 2)
+        -v if list(map(z.__getitem__, k)).count(-1) & 1 else v
         for k, v in H.items()
     )
 
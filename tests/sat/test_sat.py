@@ -18,7 +18,7 @@ Contains tests for the ``qubovert.sat`` library.
 
 from qubovert import PUBO, boolean_var, BOOLEAN_MODELS
 from qubovert.sat import BUFFER, NOT, AND, NAND, OR, NOR, XOR, XNOR
-from qubovert.utils import decimal_to_boolean
+from itertools import product
 
 
 def test_sat_one():
@@ -57,9 +57,8 @@ def test_sat_and():
 
     for n in range(1, 5):
         P = f(*tuple(range(n)))
-        for i in range(1 << n):
-            sol = decimal_to_boolean(i, n)
-            if all(sol):
+        for i, sol in enumerate(product((0, 1), repeat=n)):
+            if i == (1 << n) - 1:  # all(sol)
                 assert P.value(sol) == 1
             else:
                 assert not P.value(sol)
@@ -80,9 +79,8 @@ def test_sat_nand():
 
     for n in range(1, 5):
         P = f(*tuple(range(n)))
-        for i in range(1 << n):
-            sol = decimal_to_boolean(i, n)
-            if all(sol):
+        for i, sol in enumerate(product((0, 1), repeat=n)):
+            if i == (1 << n) - 1:  # all(sol)
                 assert not P.value(sol)
             else:
                 assert P.value(sol) == 1
@@ -106,9 +104,8 @@ def test_sat_or():
 
     for n in range(1, 5):
         P = f(*tuple(range(n)))
-        for i in range(1 << n):
-            sol = decimal_to_boolean(i, n)
-            if any(sol):
+        for i, sol in enumerate(product((0, 1), repeat=n)):
+            if i:  # any(sol)
                 assert P.value(sol) == 1
             else:
                 assert not P.value(sol)
@@ -134,9 +131,8 @@ def test_sat_nor():
 
     for n in range(1, 5):
         P = f(*tuple(range(n)))
-        for i in range(1 << n):
-            sol = decimal_to_boolean(i, n)
-            if any(sol):
+        for i, sol in enumerate(product((0, 1), repeat=n)):
+            if i:  # any(sol)
                 assert not P.value(sol)
             else:
                 assert P.value(sol) == 1
@@ -160,9 +156,8 @@ def test_sat_xor():
 
     for n in range(1, 5):
         P = f(*tuple(range(n)))
-        for i in range(1 << n):
-            sol = decimal_to_boolean(i, n)
-            if sum(sol) % 2 == 1:
+        for i, sol in enumerate(product((0, 1), repeat=n)):
+            if bin(i).count('1') % 2:  # sum(sol) is odd
                 assert P.value(sol) == 1
             else:
                 assert not P.value(sol)
@@ -188,9 +183,8 @@ def test_sat_xnor():
 
     for n in range(1, 5):
         P = f(*tuple(range(n)))
-        for i in range(1 << n):
-            sol = decimal_to_boolean(i, n)
-            if sum(sol) % 2 == 1:
+        for i, sol in enumerate(product((0, 1), repeat=n)):
+            if bin(i).count('1') % 2:  # sum(sol) is odd
                 assert not P.value(sol)
             else:
                 assert P.value(sol) == 1
@@ -20,13 +20,51 @@ from qubovert import PCBO, boolean_var, integer_var
 from qubovert.utils import (
     solve_qubo_bruteforce, solve_quso_bruteforce,
     solve_pubo_bruteforce, solve_puso_bruteforce,
-    pubo_value, decimal_to_boolean, QUBOVertWarning, PUBOMatrix
+    pubo_value, QUBOVertWarning, PUBOMatrix, boolean_to_decimal
 )
 from sympy import Symbol
-from numpy import allclose
+from array import array
+import pytest
+from numpy import allclose, arange, bitwise_xor, uint8, unpackbits
 from numpy.testing import assert_raises, assert_warns
 
 
+# every boolean assignment of n variables, in the same order as
+# (decimal_to_boolean(i, n) for i in range(1 << n)), unpacked all at once.
+# TRUTH_TABLES holds them as (1 << n, n) arrays, and BOOLEAN_TABLES as one
+# array.array per assignment, which index to ints without holding a list of
+# int objects per row.
+TRUTH_TABLES = {
+    n: unpackbits(arange(1 << n, dtype=uint8)[:, None], axis=1)[:, 8 - n:]
+    for n in (2, 3, 6)
+}
+BOOLEAN_TABLES = {
+    n: [array('b', row.tobytes()) for row in table]
+    for n, table in TRUTH_TABLES.items()
+}
+
+
+# the base problems that the tests build on. Each test works on a copy so
+# that they are only constructed once.
+BASE_PCBO = PCBO({
+    ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2
+})
+BASE_PCBO_D = PCBO({
+    ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
+    ('d',): -1
+})
+DEG_3_PCBO = PCBO({
+    ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
+    (0, 1, 2): 1, (0,): -1, (1,): -2, (2,): 1
+})
+DEG_5_PCBO = PCBO({
+    ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
+    (0, 1, 2): 1, (0,): -1, (1,): -2, (2,): 1, ('a', 0, 4, 'b', 'c'): -3,
+    (4, 2, 3, 'a', 'b'): 2, (4, 2, 3, 'b'): -1, ('c',): 4, (3,): 1,
+    (0, 1): -2
+})
+
+
 def test_pretty_str():
 
     def equal(expression, string):
@@ -75,24 +113,34 @@ class Problem:
     def is_valid(self, e, solution, spin):
 
         sol = self.problem.convert_solution(solution, spin)
-        return all((
-            self.problem.is_solution_valid(sol),
-            self.problem.is_solution_valid(solution),
-            sol == self.solution,
-            allclose(e, self.obj)
-        ))
+        return (
+            self.problem.is_solution_valid(sol) and
+            self.problem.is_solution_valid(solution) and
+            sol == self.solution and
+            abs(e - self.obj) < 1e-8
+        )
+
+    def runtests(self, deg):
 
-    def runtests(self):
+        # every problem is run with deg None, so the problem itself only needs
+        # to be brute forced in that case rather than once per degree.
+        if deg is None:
+            assert self.problem.solve_bruteforce() == self.solution
 
-        assert self.problem.solve_bruteforce() == self.solution
+        if deg == 2:
 
-        e, sol = solve_qubo_bruteforce(self.problem.to_qubo())
-        assert self.is_valid(e, sol, False)
+            e, sol = solve_quso_bruteforce(self.problem.to_quso())
+            assert self.is_valid(e, sol, True)
+
+            e, sol = solve_qubo_bruteforce(self.problem.to_qubo())
+            assert self.is_valid(e, sol, False)
 
-        e, sol = solve_quso_bruteforce(self.problem.to_quso())
-        assert self.is_valid(e, sol, True)
+        if deg == 2 and self.problem.degree <= 2:
+            # the degree 2 PUSO and PUBO are the QUSO and QUBO solved above
+            assert self.problem.to_puso(deg) == self.problem.to_quso()
+            assert self.problem.to_pubo(deg) == self.problem.to_qubo()
 
-        for deg in (None,) + tuple(range(2, self.problem.degree + 1)):
+        else:
 
             e, sol = solve_puso_bruteforce(self.problem.to_puso(deg))
             assert self.is_valid(e, sol, True)
@@ -107,41 +155,37 @@ class Problem:
         )
 
 
-def test_pcbo_on_qubo():
+# each degree is collected as its own case so that the brute force
+# enumerations can be scheduled independently (eg with pytest-xdist).
+
+@pytest.mark.parametrize('deg', (None, 2))
+def test_pcbo_on_qubo(deg):
 
-    problem = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2
-    })
+    problem = BASE_PCBO.copy()
     solution = {'c': 1, 'b': 1, 'a': 1}
     obj = -8
 
-    Problem(problem, solution, obj).runtests()
+    Problem(problem, solution, obj).runtests(deg)
 
 
-def test_pcbo_on_deg_3_pubo():
+@pytest.mark.parametrize('deg', (None, 2, 3))
+def test_pcbo_on_deg_3_pubo(deg):
 
-    problem = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        (0, 1, 2): 1, (0,): -1, (1,): -2, (2,): 1
-    })
+    problem = DEG_3_PCBO.copy()
     solution = {'c': 1, 'b': 1, 'a': 1, 0: 1, 1: 1, 2: 0}
     obj = -11
 
-    Problem(problem, solution, obj).runtests()
+    Problem(problem, solution, obj).runtests(deg)
 
 
-def test_pcbo_on_deg_5_pubo():
+@pytest.mark.parametrize('deg', (None, 2, 3, 4, 5))
+def test_pcbo_on_deg_5_pubo(deg):
 
-    problem = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        (0, 1, 2): 1, (0,): -1, (1,): -2, (2,): 1, ('a', 0, 4, 'b', 'c'): -3,
-        (4, 2, 3, 'a', 'b'): 2, (4, 2, 3, 'b'): -1, ('c',): 4, (3,): 1,
-        (0, 1): -2
-    })
+    problem = DEG_5_PCBO.copy()
     solution = {0: 1, 1: 1, 'c': 1, 2: 0, 4: 1, 3: 0, 'b': 1, 'a': 1}
     obj = -12
 
-    Problem(problem, solution, obj).runtests()
+    Problem(problem, solution, obj).runtests(deg)
 
 
 # testing methods
@@ -444,7 +488,13 @@ def test_boolean_var():
     x = [boolean_var(i) for i in range(5)]
     assert all(x[i] == {(i,): 1} for i in range(5))
     assert x[0] * x[1] * x[2] == {(0, 1, 2): 1}
-    assert sum(x) == {(i,): 1 for i in range(5)}
+
+    # accumulating in place only ever updates one PCBO
+    total = PCBO()
+    for xi in x:
+        total += xi
+    assert total == sum(x) == {(i,): 1 for i in range(5)}
+
     assert isinstance(x[0], PCBO)
     assert all(x[i].name == i for i in range(5))
 
@@ -475,9 +525,7 @@ def test_pcbo_eq_constraint():
 
     lam = Symbol('lam')
 
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2
-    })
+    P = BASE_PCBO.copy()
     P.add_constraint_eq_zero(
         {('a',): 1, ('b',): 1, ('b', 'c'): -1},
         lam=lam
@@ -516,9 +564,7 @@ def test_pcbo_eq_constraint():
     ))
 
     # lam = 0
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2
-    })
+    P = BASE_PCBO.copy()
     P.add_constraint_eq_zero(
         {('a',): 1, ('b',): 1, ('b', 'c'): -1},
         lam=0
@@ -541,20 +587,25 @@ def test_pcbo_eq_constraint():
 
 def test_pcbo_ne_constraint_logtrick():
 
+    a2, a4 = integer_var('a', 2), integer_var('a', 4)
+
     for i in range(1 << 4):
-        P = integer_var('a', 4) - i
+        P = a4.copy()
+        P[()] -= i
         H = PCBO().add_constraint_ne_zero(P)
         for sol in H.solve_bruteforce(True):
             assert P.value(sol)
 
     for i in range(1 << 4):
-        P = integer_var('a', 4) - i
+        P = a4.copy()
+        P[()] -= i
         H = PCBO(P).add_constraint_ne_zero(P, lam=0)
         for sol in H.solve_bruteforce(True):
             assert P.value(sol)
 
     for i in range(1 << 2):
-        P = integer_var('a', 2) - i
+        P = a2.copy()
+        P[()] -= i
         H = PCBO().add_constraint_ne_zero(P)
         for sol in solve_pubo_bruteforce(H, True)[1]:
             assert P.value(sol)
@@ -562,20 +613,25 @@ def test_pcbo_ne_constraint_logtrick():
 
 def test_pcbo_ne_constraint():
 
+    a2 = integer_var('a', 2)
+
     for i in range(1 << 2):
-        P = integer_var('a', 2) - i
+        P = a2.copy()
+        P[()] -= i
         H = PCBO().add_constraint_ne_zero(P, log_trick=False)
         for sol in H.solve_bruteforce(True):
             assert P.value(sol)
 
     for i in range(1 << 2):
-        P = integer_var('a', 2) - i
+        P = a2.copy()
+        P[()] -= i
         H = PCBO(P).add_constraint_ne_zero(P, lam=0, log_trick=False)
         for sol in H.solve_bruteforce(True):
             assert P.value(sol)
 
     for i in range(1 << 2):
-        P = integer_var('a', 2) - i
+        P = a2.copy()
+        P[()] -= i
         H = PCBO().add_constraint_ne_zero(P, log_trick=False)
         for sol in solve_pubo_bruteforce(H, True)[1]:
             assert P.value(sol)
@@ -599,9 +655,7 @@ def test_pcbo_lt_constraint_logtrick():
 
     lam = Symbol("lam")
 
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2
-    })
+    P = BASE_PCBO.copy()
     P.add_constraint_lt_zero(
         {('a',): 1, ('b',): 1, ('b', 'c'): 1, (): -3},
         lam=lam
@@ -643,9 +697,7 @@ def test_pcbo_lt_constraint_logtrick():
     ))
 
     # lam = 0
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2
-    })
+    P = BASE_PCBO.copy()
     P.add_constraint_lt_zero(
         {('a',): 1, ('b',): 1, ('b', 'c'): 1, (): -3},
         lam=0
@@ -671,9 +723,7 @@ def test_pcbo_lt_constraint():
 
     lam = Symbol("lam")
 
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2
-    })
+    P = BASE_PCBO.copy()
     P.add_constraint_lt_zero(
         {('a',): 1, ('b',): 1, ('b', 'c'): 1, (): -3},
         lam=lam, log_trick=False
@@ -719,10 +769,7 @@ def test_pcbo_le_constraint_logtrick():
 
     lam = Symbol("lam")
 
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        ('d',): -1
-    })
+    P = BASE_PCBO_D.copy()
     P.add_constraint_le_zero(
         {('a',): 1, ('b',): 1, ('b', 'c'): 1, ('d',): 1, (): -3},
         lam=lam
@@ -764,10 +811,7 @@ def test_pcbo_le_constraint_logtrick():
     ))
 
     # lam = 0
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        ('d',): -1
-    })
+    P = BASE_PCBO_D.copy()
     P.add_constraint_le_zero(
         {('a',): 1, ('b',): 1, ('b', 'c'): 1, ('d',): 1, (): -3},
         lam=0
@@ -793,10 +837,7 @@ def test_pcbo_le_constraint():
 
     lam = Symbol("lam")
 
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        ('d',): -1
-    })
+    P = BASE_PCBO_D.copy()
     P.add_constraint_le_zero(
         {('a',): 1, ('b',): 1, ('b', 'c'): 1, ('d',): 1, (): -3},
         lam=lam, log_trick=False
@@ -842,10 +883,7 @@ def test_pcbo_le_constraint_minval_zero():
 
     lam = Symbol("lam")
 
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        ('d',): -1
-    })
+    P = BASE_PCBO_D.copy()
     P.add_constraint_le_zero(
         {('a',): 1, ('b',): 1, ('b', 'c'): 1, ('d',): 1},
         lam=lam
@@ -872,10 +910,7 @@ def test_pcbo_le_constraint_minval_zero():
 
     lam = Symbol("lam")
 
-    P1 = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        ('d',): -1
-    })
+    P1 = BASE_PCBO_D.copy()
     P1.add_constraint_le_zero(
         {('a',): 1, ('b',): 1, ('b', 'c'): 1, ('d',): 1},
         lam=lam, log_trick=False
@@ -887,9 +922,7 @@ def test_pcbo_gt_constraint_logtrick():
 
     lam = Symbol("lam")
 
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2
-    })
+    P = BASE_PCBO.copy()
     P.add_constraint_gt_zero(
         {('a',): -1, ('b',): -1, ('b', 'c'): -1, (): 3},
         lam=lam
@@ -931,9 +964,7 @@ def test_pcbo_gt_constraint_logtrick():
     ))
 
     # lam = 0
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2
-    })
+    P = BASE_PCBO.copy()
     P.add_constraint_gt_zero(
         {('a',): -1, ('b',): -1, ('b', 'c'): -1, (): 3},
         lam=0
@@ -959,9 +990,7 @@ def test_pcbo_gt_constraint():
 
     lam = Symbol("lam")
 
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2
-    })
+    P = BASE_PCBO.copy()
     P.add_constraint_gt_zero(
         {('a',): -1, ('b',): -1, ('b', 'c'): -1, (): 3},
         lam=lam, log_trick=False
@@ -1007,10 +1036,7 @@ def test_pcbo_ge_constraint_logtrick():
 
     lam = Symbol("lam")
 
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        ('d',): -1
-    })
+    P = BASE_PCBO_D.copy()
     P.add_constraint_ge_zero(
         {('a',): -1, ('b',): -1, ('b', 'c'): -1, ('d',): -1, (): 3},
         lam=lam
@@ -1052,10 +1078,7 @@ def test_pcbo_ge_constraint_logtrick():
     ))
 
     # lam = 0
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        ('d',): -1
-    })
+    P = BASE_PCBO_D.copy()
     P.add_constraint_ge_zero(
         {('a',): -1, ('b',): -1, ('b', 'c'): -1, ('d',): -1, (): 3},
         lam=0
@@ -1081,10 +1104,7 @@ def test_pcbo_ge_constraint():
 
     lam = Symbol("lam")
 
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        ('d',): -1
-    })
+    P = BASE_PCBO_D.copy()
     P.add_constraint_ge_zero(
         {('a',): -1, ('b',): -1, ('b', 'c'): -1, ('d',): -1, (): 3},
         lam=lam, log_trick=False
@@ -1126,61 +1146,30 @@ def test_pcbo_ge_constraint():
     ))
 
 
-def test_pcbo_constraints_warnings():
-
-    with assert_warns(QUBOVertWarning):  # qlwayss satisfied
-        PCBO().add_constraint_eq_zero({(): 0})
+@pytest.mark.parametrize('kind,P', (
+    ('eq', {(): 0}),  # always satisfied
+    ('eq', {(): 1, (0,): -.5}),  # not satisfiable
+    ('eq', {(): -1, (0,): .5}),  # not satisfiable
+    ('lt', {(): 1, (0,): -.5}),  # not satisfiable
+    ('lt', {(): 1, (0,): -1}),  # not satisfiable
+    ('lt', {(): -1, (0,): -.5}),  # always satisfied
+    ('le', {(): 1, (0,): -.5}),  # not satisfiable
+    ('le', {(): -1, (0,): -.5}),  # always satisfied
+    ('gt', {(): -1, (0,): .5}),  # not satisfiable
+    ('gt', {(): -1, (0,): 1}),  # not satisfiable
+    ('gt', {(): 1, (0,): .5}),  # always satisfied
+    ('ge', {(): -1, (0,): .5}),  # not satisfiable
+    ('ge', {(): 1, (0,): .5}),  # always satisfied
+))
+def test_pcbo_constraints_warnings(kind, P):
 
-    with assert_warns(QUBOVertWarning):  # not satisfiable
-        PCBO().add_constraint_eq_zero({(): 1, (0,): -.5})
+    add_constraint = 'add_constraint_%s_zero' % kind
 
-    with assert_warns(QUBOVertWarning):  # not satisfiable
-        PCBO().add_constraint_eq_zero({(): -1, (0,): .5})
+    with assert_warns(QUBOVertWarning):
+        getattr(PCBO(), add_constraint)(P)
 
-    with assert_warns(QUBOVertWarning):  # not satisfiable
-        PCBO().add_constraint_lt_zero({(): 1, (0,): -.5})
-
-    with assert_warns(QUBOVertWarning):  # not satisfiable
-        PCBO().add_constraint_lt_zero({(): 1, (0,): -1})
-
-    with assert_warns(QUBOVertWarning):  # always satisfied
-        PCBO().add_constraint_lt_zero({(): -1, (0,): -.5})
-
-    with assert_warns(QUBOVertWarning):  # not satisfiable
-        PCBO().add_constraint_le_zero({(): 1, (0,): -.5})
-
-    with assert_warns(QUBOVertWarning):  # always satisfied
-        PCBO().add_constraint_le_zero({(): -1, (0,): -.5})
-
-    with assert_warns(QUBOVertWarning):  # not satisfiable
-        PCBO().add_constraint_gt_zero({(): -1, (0,): .5})
-
-    with assert_warns(QUBOVertWarning):  # not satisfiable
-        PCBO().add_constraint_gt_zero({(): -1, (0,): 1})
-
-    with assert_warns(QUBOVertWarning):  # always satisfied
-        PCBO().add_constraint_gt_zero({(): 1, (0,): .5})
-
-    with assert_warns(QUBOVertWarning):  # not satisfiable
-        PCBO().add_constraint_ge_zero({(): -1, (0,): .5})
-
-    with assert_warns(QUBOVertWarning):  # always satisfied
-        PCBO().add_constraint_ge_zero({(): 1, (0,): .5})
-
-    # all the same but with ignore warnings
-    PCBO().add_constraint_eq_zero({(): 0}, suppress_warnings=True)
-    PCBO().add_constraint_eq_zero({(): 1, (0,): -.5}, suppress_warnings=True)
-    PCBO().add_constraint_eq_zero({(): -1, (0,): .5}, suppress_warnings=True)
-    PCBO().add_constraint_lt_zero({(): 1, (0,): -.5}, suppress_warnings=True)
-    PCBO().add_constraint_lt_zero({(): 1, (0,): -1}, suppress_warnings=True)
-    PCBO().add_constraint_lt_zero({(): -1, (0,): -.5}, suppress_warnings=True)
-    PCBO().add_constraint_le_zero({(): 1, (0,): -.5}, suppress_warnings=True)
-    PCBO().add_constraint_le_zero({(): -1, (0,): -.5}, suppress_warnings=True)
-    PCBO().add_constraint_gt_zero({(): -1, (0,): .5}, suppress_warnings=True)
-    PCBO().add_constraint_gt_zero({(): -1, (0,): 1}, suppress_warnings=True)
-    PCBO().add_constraint_gt_zero({(): 1, (0,): .5}, suppress_warnings=True)
-    PCBO().add_constraint_ge_zero({(): -1, (0,): .5}, suppress_warnings=True)
-    PCBO().add_constraint_ge_zero({(): 1, (0,): .5}, suppress_warnings=True)
+    # the same but with ignore warnings
+    getattr(PCBO(), add_constraint)(P, suppress_warnings=True)
 
 
 def test_pcbo_logic():
@@ -1197,460 +1186,119 @@ def test_pcbo_logic():
     with assert_raises(ValueError):
         PCBO().add_constraint_eq_AND('a')
 
-    H = PCBO().add_constraint_eq_NAND(
-        'c', 'a', 'b').add_constraint_AND('a', 'b')
-    sols = H.solve_bruteforce(True)
-    assert len(sols) == 1 and sols[0] == {'a': 1, 'b': 1, 'c': 0}
-
-    H = PCBO().add_constraint_eq_OR(
-        'c', 'a', 'b').add_constraint_NOR('a', 'b')
-    sols = H.solve_bruteforce(True)
-    assert len(sols) == 1 and sols[0] == {'a': 0, 'b': 0, 'c': 0}
 
-    H = PCBO().add_constraint_eq_XOR(
+@pytest.mark.parametrize('H,solution', (
+    (PCBO().add_constraint_eq_NAND(
+        'c', 'a', 'b').add_constraint_AND('a', 'b'),
+     {'a': 1, 'b': 1, 'c': 0}),
+    (PCBO().add_constraint_eq_OR(
+        'c', 'a', 'b').add_constraint_NOR('a', 'b'),
+     {'a': 0, 'b': 0, 'c': 0}),
+    (PCBO().add_constraint_eq_XOR(
         'c', 'a', 'b').add_constraint_XNOR(
-        'a', 'b').add_constraint_BUFFER('a')
-    sols = H.solve_bruteforce(True)
-    assert len(sols) == 1 and sols[0] == {'a': 1, 'b': 1, 'c': 0}
-
-    H = PCBO().add_constraint_eq_NOT('a', 'b').add_constraint_BUFFER('a')
-    sols = H.solve_bruteforce(True)
-    assert len(sols) == 1 and sols[0] == {'a': 1, 'b': 0}
-
-    H = PCBO().add_constraint_NAND('a', 'b').add_constraint_NOT(
+        'a', 'b').add_constraint_BUFFER('a'),
+     {'a': 1, 'b': 1, 'c': 0}),
+    (PCBO().add_constraint_eq_NOT('a', 'b').add_constraint_BUFFER('a'),
+     {'a': 1, 'b': 0}),
+    (PCBO().add_constraint_NAND('a', 'b').add_constraint_NOT(
         'a').add_constraint_OR(
-        'a', 'b').add_constraint_eq_BUFFER('a', 'c')
-    sols = H.solve_bruteforce(True)
-    assert len(sols) == 1 and sols[0] == {'a': 0, 'b': 1, 'c': 0}
-
-    H = PCBO().add_constraint_XOR('a', 'b').add_constraint_eq_NOR(
+        'a', 'b').add_constraint_eq_BUFFER('a', 'c'),
+     {'a': 0, 'b': 1, 'c': 0}),
+    (PCBO().add_constraint_XOR('a', 'b').add_constraint_eq_NOR(
         'b', 'a', 'c').add_constraint_BUFFER(
             'c'
-        ).add_constraint_eq_BUFFER('a', 'c')
-    sols = H.solve_bruteforce(True)
-    assert len(sols) == 1 and sols[0] == {'a': 1, 'b': 0, 'c': 1}
+        ).add_constraint_eq_BUFFER('a', 'c'),
+     {'a': 1, 'b': 0, 'c': 1}),
+    (PCBO().add_constraint_eq_AND('c', 'a', 'b').add_constraint_eq_XNOR(
+        'c', 'a', 'b').add_constraint_BUFFER('c'),
+     {'c': 1, 'a': 1, 'b': 1}),
+))
+def test_pcbo_logic_combinations(H, solution):
 
-    H = PCBO().add_constraint_eq_AND('c', 'a', 'b').add_constraint_eq_XNOR(
-        'c', 'a', 'b').add_constraint_BUFFER('c')
     sols = H.solve_bruteforce(True)
-    assert len(sols) == 1 and sols[0] == {'c': 1, 'a': 1, 'b': 1}
-
-    # add_constraint_eq_NOR
-    H = PCBO().add_constraint_eq_NOR(0, 1, 2, 3, 4, 5)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert (not any(sol[i] for i in range(1, 6))) == sol[0]
-        assert not H.value(sol)
-    H = PCBO().add_constraint_eq_NOR(0, 1, 2, 3, 4, 5)
-    for sol in (decimal_to_boolean(i, 6) for i in range(1 << 6)):
-        if (not any(sol[i] for i in range(1, 6))) == sol[0]:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    H = PCBO().add_constraint_eq_NOR(0, 1, 2)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert (not any(sol[i] for i in range(1, 3))) == sol[0]
-        assert not H.value(sol)
-    H = PCBO().add_constraint_eq_NOR(0, 1, 2)
-    for sol in (decimal_to_boolean(i, 3) for i in range(1 << 3)):
-        if (not any(sol[i] for i in range(1, 3))) == sol[0]:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    # add_constraint_eq_OR
-    H = PCBO().add_constraint_eq_OR(0, 1, 2, 3, 4, 5)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert any(sol[i] for i in range(1, 6)) == sol[0]
-        assert not H.value(sol)
-    H = PCBO().add_constraint_eq_OR(0, 1, 2, 3, 4, 5)
-    for sol in (decimal_to_boolean(i, 6) for i in range(1 << 6)):
-        if any(sol[i] for i in range(1, 6)) == sol[0]:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    H = PCBO().add_constraint_eq_OR(0, 1, 2)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert any(sol[i] for i in range(1, 3)) == sol[0]
-        assert not H.value(sol)
-    H = PCBO().add_constraint_eq_OR(0, 1, 2)
-    for sol in (decimal_to_boolean(i, 3) for i in range(1 << 3)):
-        if any(sol[i] for i in range(1, 3)) == sol[0]:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    # add_constraint_eq_NAND
-    H = PCBO().add_constraint_eq_NAND(0, 1, 2, 3, 4, 5)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert (not all(sol[i] for i in range(1, 6))) == sol[0]
-        assert not H.value(sol)
-    H = PCBO().add_constraint_eq_NAND(0, 1, 2, 3, 4, 5)
-    for sol in (decimal_to_boolean(i, 6) for i in range(1 << 6)):
-        if (not all(sol[i] for i in range(1, 6))) == sol[0]:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    H = PCBO().add_constraint_eq_NAND(0, 1, 2)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert (not all(sol[i] for i in range(1, 3))) == sol[0]
-        assert not H.value(sol)
-    H = PCBO().add_constraint_eq_NAND(0, 1, 2)
-    for sol in (decimal_to_boolean(i, 3) for i in range(1 << 3)):
-        if (not all(sol[i] for i in range(1, 3))) == sol[0]:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    # add_constraint_eq_AND
-    H = PCBO().add_constraint_eq_AND(0, 1, 2, 3, 4, 5)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert all(sol[i] for i in range(1, 6)) == sol[0]
-        assert not H.value(sol)
-    H = PCBO().add_constraint_eq_AND(0, 1, 2, 3, 4, 5)
-    for sol in (decimal_to_boolean(i, 6) for i in range(1 << 6)):
-        if all(sol[i] for i in range(1, 6)) == sol[0]:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    H = PCBO().add_constraint_eq_AND(0, 1, 2)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert all(sol[i] for i in range(1, 3)) == sol[0]
-        assert not H.value(sol)
-    H = PCBO().add_constraint_eq_AND(0, 1, 2)
-    for sol in (decimal_to_boolean(i, 3) for i in range(1 << 3)):
-        if all(sol[i] for i in range(1, 3)) == sol[0]:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    # add_constraint_eq_XOR
-    H = PCBO().add_constraint_eq_XOR(0, 1, 2, 3, 4, 5)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert sum(sol[i] for i in range(1, 6)) % 2 == sol[0]
-        assert not H.value(sol)
-    H = PCBO().add_constraint_eq_XOR(0, 1, 2, 3, 4, 5)
-    for sol in (decimal_to_boolean(i, 6) for i in range(1 << 6)):
-        if sum(sol[i] for i in range(1, 6)) % 2 == sol[0]:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    H = PCBO().add_constraint_eq_XOR(0, 1, 2)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert sum(sol[i] for i in range(1, 3)) % 2 == sol[0]
-        assert not H.value(sol)
-    H = PCBO().add_constraint_eq_XOR(0, 1, 2)
-    for sol in (decimal_to_boolean(i, 3) for i in range(1 << 3)):
-        if sum(sol[i] for i in range(1, 3)) % 2 == sol[0]:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    # add_constraint_eq_XNOR
-    H = PCBO().add_constraint_eq_XNOR(0, 1, 2, 3, 4, 5)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert (not sum(sol[i] for i in range(1, 6)) % 2) == sol[0]
-        assert not H.value(sol)
-    H = PCBO().add_constraint_eq_XNOR(0, 1, 2, 3, 4, 5)
-    for sol in (decimal_to_boolean(i, 6) for i in range(1 << 6)):
-        if (not sum(sol[i] for i in range(1, 6)) % 2) == sol[0]:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    H = PCBO().add_constraint_eq_XNOR(0, 1, 2)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert (not sum(sol[i] for i in range(1, 3)) % 2) == sol[0]
-        assert not H.value(sol)
-    H = PCBO().add_constraint_eq_XNOR(0, 1, 2)
-    for sol in (decimal_to_boolean(i, 3) for i in range(1 << 3)):
-        if (not sum(sol[i] for i in range(1, 3)) % 2) == sol[0]:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    # NOR
-    H = PCBO().add_constraint_NOR(0, 1, 2, 3, 4, 5)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert not any(sol[i] for i in range(6))
-        assert not H.value(sol)
-    H = PCBO().add_constraint_NOR(0, 1, 2, 3, 4, 5)
-    for sol in (decimal_to_boolean(i, 6) for i in range(1 << 6)):
-        if not any(sol[i] for i in range(6)):
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    H = PCBO().add_constraint_NOR(0, 1)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert not any(sol[i] for i in range(2))
-        assert not H.value(sol)
-    H = PCBO().add_constraint_NOR(0, 1)
-    for sol in (decimal_to_boolean(i, 2) for i in range(1 << 2)):
-        if not any(sol[i] for i in range(2)):
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
+    assert len(sols) == 1 and sols[0] == solution
+
+
+# the logic constraints on the variables 0, ..., n-1, with a function of the
+# truth table TRUTH_TABLES[n] that says which of its rows are valid
+# assignments. In the eq constraints, variable 0 is the output.
+LOGIC_CONSTRAINTS = (
+    ('eq_NOR', 6, lambda T: ~T[:, 1:].any(1) == T[:, 0]),
+    ('eq_NOR', 3, lambda T: ~T[:, 1:].any(1) == T[:, 0]),
+    ('eq_OR', 6, lambda T: T[:, 1:].any(1) == T[:, 0]),
+    ('eq_OR', 3, lambda T: T[:, 1:].any(1) == T[:, 0]),
+    ('eq_NAND', 6, lambda T: ~T[:, 1:].all(1) == T[:, 0]),
+    ('eq_NAND', 3, lambda T: ~T[:, 1:].all(1) == T[:, 0]),
+    ('eq_AND', 6, lambda T: T[:, 1:].all(1) == T[:, 0]),
+    ('eq_AND', 3, lambda T: T[:, 1:].all(1) == T[:, 0]),
+    ('eq_XOR', 6, lambda T: bitwise_xor.reduce(T[:, 1:], 1) == T[:, 0]),
+    ('eq_XOR', 3, lambda T: bitwise_xor.reduce(T[:, 1:], 1) == T[:, 0]),
+    ('eq_XNOR', 6, lambda T: bitwise_xor.reduce(T[:, 1:], 1) != T[:, 0]),
+    ('eq_XNOR', 3, lambda T: bitwise_xor.reduce(T[:, 1:], 1) != T[:, 0]),
+    ('NOR', 6, lambda T: ~T.any(1)),
+    ('NOR', 2, lambda T: ~T.any(1)),
+    ('OR', 6, lambda T: T.any(1)),
+    ('OR', 2, lambda T: T.any(1)),
+    ('NAND', 6, lambda T: ~T.all(1)),
+    ('NAND', 2, lambda T: ~T.all(1)),
+    ('AND', 6, lambda T: T.all(1)),
+    ('AND', 2, lambda T: T.all(1)),
+    ('XOR', 6, lambda T: bitwise_xor.reduce(T, 1) == 1),
+    ('XOR', 2, lambda T: bitwise_xor.reduce(T, 1) == 1),
+    ('XNOR', 6, lambda T: bitwise_xor.reduce(T, 1) == 0),
+    ('XNOR', 2, lambda T: bitwise_xor.reduce(T, 1) == 0),
+)
 
-    # OR
-    H = PCBO().add_constraint_OR(0, 1, 2, 3, 4, 5)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert any([sol[i] for i in range(6)])  # list so all branches covered
-        assert not H.value(sol)
-    H = PCBO().add_constraint_OR(0, 1, 2, 3, 4, 5)
-    for sol in (decimal_to_boolean(i, 6) for i in range(1 << 6)):
-        if any(sol[i] for i in range(6)):
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
 
-    H = PCBO().add_constraint_OR(0, 1)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert any([sol[i] for i in range(2)])  # list so all branches covered
-        assert not H.value(sol)
-    H = PCBO().add_constraint_OR(0, 1)
-    for sol in (decimal_to_boolean(i, 2) for i in range(1 << 2)):
-        if any(sol[i] for i in range(2)):
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
+@pytest.mark.parametrize('constraint,n,valid', LOGIC_CONSTRAINTS)
+def test_pcbo_logic_constraints(constraint, n, valid):
 
-    # NAND
-    H = PCBO().add_constraint_NAND(0, 1, 2, 3, 4, 5)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        # list so all branches covered
-        assert not all([sol[i] for i in range(6)])
-        assert not H.value(sol)
-    H = PCBO().add_constraint_NAND(0, 1, 2, 3, 4, 5)
-    for sol in (decimal_to_boolean(i, 6) for i in range(1 << 6)):
-        if not all(sol[i] for i in range(6)):
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
+    H = getattr(PCBO(), 'add_constraint_' + constraint)(*range(n))
 
-    H = PCBO().add_constraint_NAND(0, 1)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        # list so all branches covered
-        assert not all([sol[i] for i in range(2)])
-        assert not H.value(sol)
-    H = PCBO().add_constraint_NAND(0, 1)
-    for sol in (decimal_to_boolean(i, 2) for i in range(1 << 2)):
-        if not all(sol[i] for i in range(2)):
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
+    # evaluate the expected validity of every assignment at once. Row i of
+    # the truth table is the assignment with variable 0 as the most
+    # significant bit of i.
+    expected = valid(TRUTH_TABLES[n]).tolist()
 
-    # AND
-    H = PCBO().add_constraint_AND(0, 1, 2, 3, 4, 5)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert all(sol[i] for i in range(6))
-        assert not H.value(sol)
-    H = PCBO().add_constraint_AND(0, 1, 2, 3, 4, 5)
-    for sol in (decimal_to_boolean(i, 6) for i in range(1 << 6)):
-        if all(sol[i] for i in range(6)):
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
+    # H has no ancillas, so solve_bruteforce searches the same assignments.
+    # Evaluate H on each of them once and check the solutions against that.
+    assert H.num_binary_variables == n
+    values = [H.value(sol) for sol in BOOLEAN_TABLES[n]]
 
-    H = PCBO().add_constraint_AND(0, 1)
     sols = H.solve_bruteforce(True)
     for sol in sols:
-        assert all(sol[i] for i in range(2))
-        assert not H.value(sol)
-    H = PCBO().add_constraint_AND(0, 1)
-    for sol in (decimal_to_boolean(i, 2) for i in range(1 << 2)):
-        if all(sol[i] for i in range(2)):
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    # XOR
-    H = PCBO().add_constraint_XOR(0, 1, 2, 3, 4, 5)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert sum(sol[i] for i in range(6)) % 2
-        assert not H.value(sol)
-    H = PCBO().add_constraint_XOR(0, 1, 2, 3, 4, 5)
-    for sol in (decimal_to_boolean(i, 6) for i in range(1 << 6)):
-        if sum(sol[i] for i in range(6)) % 2:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    H = PCBO().add_constraint_XOR(0, 1)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert sum(sol[i] for i in range(2)) % 2
-        assert not H.value(sol)
-    H = PCBO().add_constraint_XOR(0, 1)
-    for sol in (decimal_to_boolean(i, 2) for i in range(1 << 2)):
-        if sum(sol[i] for i in range(2)) % 2:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    # XNOR
-    H = PCBO().add_constraint_XNOR(0, 1, 2, 3, 4, 5)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert not sum(sol[i] for i in range(6)) % 2
-        assert not H.value(sol)
-    H = PCBO().add_constraint_XNOR(0, 1, 2, 3, 4, 5)
-    for sol in (decimal_to_boolean(i, 6) for i in range(1 << 6)):
-        if not sum(sol[i] for i in range(6)) % 2:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-    H = PCBO().add_constraint_XNOR(0, 1)
-    sols = H.solve_bruteforce(True)
-    for sol in sols:
-        assert not sum(sol[i] for i in range(2)) % 2
-        assert not H.value(sol)
-    H = PCBO().add_constraint_XNOR(0, 1)
-    for sol in (decimal_to_boolean(i, 2) for i in range(1 << 2)):
-        if not sum(sol[i] for i in range(2)) % 2:
-            assert H.is_solution_valid(sol)
-            assert not H.value(sol)
-        else:
-            assert not H.is_solution_valid(sol)
-            assert H.value(sol)
-
-
-def test_le_right_bounds():
-
-    lam = Symbol("lam")
-
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        ('d',): -1
-    })
-    P.add_constraint_le_zero(  # one sided bounds
-        {('a',): 1, ('b',): 1, ('b', 'c'): 1, ('d',): 1, (): -3},
-        lam=lam, log_trick=False, bounds=(None, 1)
-    )
-    solution = {'c': 1, 'b': 1, 'a': 1, 'd': 0}
-    obj = -8
-
-    problem = P.subs(lam, .5)
-    sol = problem.remove_ancilla_from_solution(problem.solve_bruteforce())
-    assert all((
-        problem.is_solution_valid(sol),
-        sol == solution
-    ))
-
-    e, sol = solve_pubo_bruteforce(problem.to_pubo())
-    sol = problem.convert_solution(sol)
-    sol = problem.remove_ancilla_from_solution(sol)
-    assert all((
-        not problem.is_solution_valid(sol),
-        sol != solution,
-        not allclose(e, obj)
-    ))
-
-    problem = P.subs(lam, 10)
-    sol = problem.solve_bruteforce()
-    sol = problem.remove_ancilla_from_solution(sol)
-    assert all((
-        problem.is_solution_valid(sol),
-        sol == solution
-    ))
-
-    e, sol = solve_pubo_bruteforce(problem.to_pubo())
-    sol = problem.convert_solution(sol)
-    sol = problem.remove_ancilla_from_solution(sol)
-    assert all((
-        problem.is_solution_valid(sol),
-        sol == solution,
-        allclose(e, obj)
-    ))
-
-
-def test_le_left_bounds():
+        i = boolean_to_decimal([sol[j] for j in range(n)])
+        assert expected[i]
+        assert not values[i]
+
+    # is_solution_valid checks the stored constraints rather than H itself,
+    # so it is compared separately from the value of H.
+    for sol, is_valid, value in zip(BOOLEAN_TABLES[n], expected, values):
+        assert H.is_solution_valid(sol) == is_valid
+        assert (not value) == is_valid
+
+
+@pytest.mark.parametrize('kind,P,bounds', (
+    # one sided bounds
+    ('le', {('a',): 1, ('b',): 1, ('b', 'c'): 1, ('d',): 1, (): -3},
+     (None, 1)),
+    ('le', {('a',): 1, ('b',): 1, ('b', 'c'): 1, ('d',): 1, (): -3},
+     (-3, None)),
+    ('ge', {('a',): -1, ('b',): -1, ('b', 'c'): -1, ('d',): -1, (): 3},
+     (-1, 3)),
+))
+def test_constraint_bounds(kind, P, bounds):
 
     lam = Symbol("lam")
 
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        ('d',): -1
-    })
-    P.add_constraint_le_zero(  # one sided bounds
-        {('a',): 1, ('b',): 1, ('b', 'c'): 1, ('d',): 1, (): -3},
-        lam=lam, log_trick=False, bounds=(-3, None)
+    H = BASE_PCBO_D.copy()
+    getattr(H, 'add_constraint_%s_zero' % kind)(
+        P, lam=lam, log_trick=False, bounds=bounds
     )
     solution = {'c': 1, 'b': 1, 'a': 1, 'd': 0}
     obj = -8
 
-    problem = P.subs(lam, .5)
+    problem = H.subs(lam, .5)
     sol = problem.remove_ancilla_from_solution(problem.solve_bruteforce())
     assert all((
         problem.is_solution_valid(sol),
@@ -1666,56 +1314,7 @@ def test_le_left_bounds():
         not allclose(e, obj)
     ))
 
-    problem = P.subs(lam, 10)
-    sol = problem.solve_bruteforce()
-    sol = problem.remove_ancilla_from_solution(sol)
-    assert all((
-        problem.is_solution_valid(sol),
-        sol == solution
-    ))
-
-    e, sol = solve_pubo_bruteforce(problem.to_pubo())
-    sol = problem.convert_solution(sol)
-    sol = problem.remove_ancilla_from_solution(sol)
-    assert all((
-        problem.is_solution_valid(sol),
-        sol == solution,
-        allclose(e, obj)
-    ))
-
-
-def test_ge_bounds():
-
-    lam = Symbol("lam")
-
-    P = PCBO({
-        ('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2,
-        ('d',): -1
-    })
-    P.add_constraint_ge_zero(  # one sided bounds
-        {('a',): -1, ('b',): -1, ('b', 'c'): -1, ('d',): -1, (): 3},
-        lam=lam, log_trick=False, bounds=(-1, 3)
-    )
-    solution = {'c': 1, 'b': 1, 'a': 1, 'd': 0}
-    obj = -8
-
-    problem = P.subs(lam, .5)
-    sol = problem.remove_ancilla_from_solution(problem.solve_bruteforce())
-    assert all((
-        problem.is_solution_valid(sol),
-        sol == solution
-    ))
-
-    e, sol = solve_pubo_bruteforce(problem.to_pubo())
-    sol = problem.convert_solution(sol)
-    sol = problem.remove_ancilla_from_solution(sol)
-    assert all((
-        not problem.is_solution_valid(sol),
-        sol != solution,
-        not allclose(e, obj)
-    ))
-
-    problem = P.subs(lam, 10)
+    problem = H.subs(lam, 10)
     sol = problem.solve_bruteforce()
     sol = problem.remove_ancilla_from_solution(sol)
     assert all((
@@ -1743,29 +1342,32 @@ def test_pcbo_special_constraint_le():
 
     # first one
 
+    pairs = {(i, j): 1 for i in range(3) for j in range(i+1, 3)}
+    split = {(0, 1): 1, (0, 2, 3): 1, (1, 2, 3): 1}
+
     H = PCBO().add_constraint_le_zero({(0,): 1, (1,): 1, (2,): 1, (): -1})
-    assert H == {(i, j): 1 for i in range(3) for j in range(i+1, 3)}
+    assert H == pairs
 
     H = PCBO().add_constraint_le_zero({(0,): 1, (1,): 1, (2, 3): 1, (): -1})
-    assert H == {(0, 1): 1, (0, 2, 3): 1, (1, 2, 3): 1}
+    assert H == split
 
     H = PCBO().add_constraint_lt_zero({(0,): 1, (1,): 1, (2,): 1, (): -2})
-    assert H == {(i, j): 1 for i in range(3) for j in range(i+1, 3)}
+    assert H == pairs
 
     H = PCBO().add_constraint_lt_zero({(0,): 1, (1,): 1, (2, 3): 1, (): -2})
-    assert H == {(0, 1): 1, (0, 2, 3): 1, (1, 2, 3): 1}
+    assert H == split
 
     H = PCBO().add_constraint_ge_zero({(0,): -1, (1,): -1, (2,): -1, (): 1})
-    assert H == {(i, j): 1 for i in range(3) for j in range(i+1, 3)}
+    assert H == pairs
 
     H = PCBO().add_constraint_ge_zero({(0,): -1, (1,): -1, (2, 3): -1, (): 1})
-    assert H == {(0, 1): 1, (0, 2, 3): 1, (1, 2, 3): 1}
+    assert H == split
 
     H = PCBO().add_constraint_gt_zero({(0,): -1, (1,): -1, (2,): -1, (): 2})
-    assert H == {(i, j): 1 for i in range(3) for j in range(i+1, 3)}
+    assert H == pairs
 
     H = PCBO().add_constraint_gt_zero({(0,): -1, (1,): -1, (2, 3): -1, (): 2})
-    assert H == {(0, 1): 1, (0, 2, 3): 1, (1, 2, 3): 1}
+    assert H == split
 
     # second one
 
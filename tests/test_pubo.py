@@ -20,11 +20,14 @@ from qubovert import PUBO
 from qubovert.utils import (
     solve_qubo_bruteforce, solve_quso_bruteforce,
     solve_pubo_bruteforce, solve_puso_bruteforce,
-    pubo_value, PUBOMatrix
+    pubo_value, PUBOMatrix, QUSOMatrix, pubo_to_puso, qubo_to_quso
 )
 from sympy import Symbol
 from numpy import allclose
 from numpy.testing import assert_raises
+import pytest
+import copy
+import random
 
 
 def test_pretty_str():
@@ -68,15 +71,21 @@ class Problem:
 
         self.problem, self.solution, self.obj = problem, solution, obj
 
+        # the different solvers often find the same solution, so remember
+        # the result of converting and checking each one.
+        self.checked = {}
+
     def is_valid(self, e, solution):
 
-        sol = self.problem.convert_solution(solution)
-        return all((
-            self.problem.is_solution_valid(sol),
-            self.problem.is_solution_valid(solution),
-            sol == self.solution,
-            allclose(e, self.obj)
-        ))
+        key = frozenset(solution.items())
+        if key not in self.checked:
+            sol = self.problem.convert_solution(solution)
+            self.checked[key] = (
+                self.problem.is_solution_valid(sol) and
+                self.problem.is_solution_valid(solution) and
+                sol == self.solution
+            )
+        return self.checked[key] and allclose(e, self.obj)
 
     def runtests(self):
 
@@ -151,6 +160,14 @@ def test_pubo_checkkey():
         PUBO({0: -1})
 
 
+def test_pubo_squash_key():
+
+    assert PUBO.squash_key(('a',)) == ('a',)
+    assert PUBO.squash_key(('a', 'a')) == ('a',)
+    assert PUBO.squash_key(('a', 0)) == PUBO.squash_key((0, 'a')) == (0, 'a')
+    assert PUBO.squash_key(('b', 0, 'a', 0)) == (0, 'a', 'b')
+
+
 def test_pubo_default_valid():
 
     d = PUBO()
@@ -171,6 +188,16 @@ def test_pubo_reinitialize_dictionary():
 
     d = PUBO({(0, 0): 1, ('1', 0): 2, (2, 0): 0, (0, '1'): 1})
     assert d in ({(0,): 1, ('1', 0): 3}, {(0,): 1, (0, '1'): 3})
+    assert d.mapping == {0: 0, '1': 1, 2: 2}
+
+    # a term that cancels still counts towards the degree, and it is added at
+    # the end if it comes back
+    d = PUBO([((0, 1, 2), 1), ((3,), 1), ((2, 1, 0), -1), ((1, 0), 1)])
+    assert list(d.items()) == [((3,), 1), ((0, 1), 1)]
+    assert d.degree == 3 and d.num_binary_variables == 4
+    assert d.copy() == d and d.copy().degree == 2
+    d = PUBO([((0, 1, 2), 1), ((3,), 1), ((2, 1, 0), -1), ((1, 2, 0), 2)])
+    assert list(d.items()) == [((3,), 1), ((0, 1, 2), 2)]
 
 
 def test_pubo_update():
@@ -259,6 +286,19 @@ def test_pubo_addition():
     g = temp1 - d
     assert g == PUBO(temp3[0])*-1
 
+    # __iadd__ and __isub__ with a PUBO
+    d = temp.copy()
+    d += PUBO(temp1)
+    assert d in temp2
+    d -= PUBO(temp1)
+    assert d == temp
+    d -= d.copy()
+    assert d == {} and d.degree == 2 and d.num_binary_variables == 2
+    d += PUBO({('a', 'b', 'c'): 1, ('a',): -1})
+    assert d == {('a', 'b', 'c'): 1, ('a',): -1}
+    assert d.degree == 3
+    assert d.mapping == {'0': 0, 1: 1, 'a': 2, 'b': 3, 'c': 4}
+
 
 def test_pubo_multiplication():
 
@@ -325,6 +365,14 @@ def test_pubo_multiplication():
     d *= {(1,): 2, ('0', '0'): -1}
     assert d in ({('0',): -1, (1, '0'): 4}, {('0',): -1, ('0', 1): 4})
 
+    # terms that cancel still count towards the degree and mapping, just
+    # like when they are set one at a time
+    d = PUBO({('c',): 1, ('a', 'b'): -1})
+    d *= {('a', 'b'): 1, ('c',): 1}
+    assert d == {('c',): 1, ('a', 'b'): -1}
+    assert d.degree == 3 and d.num_binary_variables == 3
+    assert d.mapping == {'c': 0, 'a': 1, 'b': 2}
+
     # __pow__
     d = temp.copy()
     d -= 2
@@ -333,6 +381,14 @@ def test_pubo_multiplication():
 
     d = temp.copy()
     assert d ** 3 == d * d * d
+    assert d ** 4 == d * d * d * d
+    assert d ** 5 == d * d * d * d * d
+
+    # floats are multiplied in order, since regrouping the products only
+    # agrees up to rounding
+    d = PUBO({('a',): .1, ('b',): .7, ('a', 'b'): -.3, (): .2})
+    assert d ** 5 == d * d * d * d * d
+    assert d ** 5 == pytest.approx((d * d) * (d * d) * d)
 
 
 def test_properties():
@@ -393,6 +449,16 @@ def test_symbols():
     assert d.subs(b, 1) == {(0,): -a, (0, 1): 2, (1,): 1}
     assert d.subs({a: -3, b: 4}) == {(0,): 3, (0, 1): 2, (1,): 4}
 
+    # each call returns a new object, and variables whose terms become zero
+    # stay in the mapping
+    e = d.subs(a, 2)
+    e[(0,)] += 1
+    assert d.subs(a, 2) == {(0,): -2, (0, 1): 2, (1,): b}
+    d[(1,)] += a
+    assert d.subs(a, 2) == {(0,): -2, (0, 1): 2, (1,): b + 2}
+    e = PUBO({('a',): a, ('b',): 1}).subs(a, 0)
+    assert e == {('b',): 1} and e.mapping == {'a': 0, 'b': 1}
+
 
 def test_convert_solution_all_1s():
 
@@ -445,6 +511,156 @@ def test_pubo_degree_reduction_pairs():
     assert quso2.num_binary_variables - pubo.num_binary_variables == 9
 
 
+def test_pubo_intermediate_degree_reduction():
+
+    pubo = PUBO({
+        (0, 1, 2, 3, 4): 1, (0, 1, 2, 5, 6): -2, (1, 2, 3, 4): 1,
+        (0, 2, 5): 3, (3, 4, 5, 6): -1, (1,): 2
+    })
+    n = pubo.num_binary_variables
+    P3, P4, Q = pubo.to_pubo(3), pubo.to_pubo(4), pubo.to_qubo()
+    assert (Q.degree, P3.degree, P4.degree) == (2, 3, 4)
+    assert (
+        n < P4.num_binary_variables < P3.num_binary_variables <
+        Q.num_binary_variables
+    )
+    assert len(P4) < len(P3) < len(Q)
+    assert pubo.to_pubo(pubo.degree) == pubo.to_pubo()
+
+
+def test_pubo_degree_reduction_cancellation():
+
+    # the (a, b) penalty term of the reduction exactly cancels the (a, b)
+    # term of the model, so it should not appear in the QUBO.
+    pubo = PUBO({('a', 'b', 'c'): 1, ('a', 'b'): -1})
+    Q = pubo.to_qubo(lam=1)
+    assert Q == {(3,): 3, (0, 3): -2, (1, 3): -2, (2, 3): 1}
+    assert all(Q.values())
+    assert Q.num_binary_variables == 4
+
+
+def test_pubo_reduction_cache():
+
+    pubo = PUBO({('a', 'b', 'c'): 1, ('b', 'c', 'd'): -2, ('a',): 1})
+    Q = pubo.to_qubo()
+    assert pubo.to_qubo() == Q and pubo.to_qubo() is not Q
+    assert pubo.to_qubo().num_binary_variables == Q.num_binary_variables
+
+    # mutating the result must not affect later calls
+    Q[(0,)] += 10
+    assert pubo.to_qubo() != Q
+    Q[(0,)] -= 10
+
+    # switching between penalties gives the result for each one
+    for lam in range(1, 6):
+        assert pubo.to_qubo(lam=lam) == PUBO(pubo).to_qubo(lam=lam)
+        assert pubo.to_quso(lam=lam) == PUBO(pubo).to_quso(lam=lam)
+    assert pubo.to_qubo(lam=3) != Q
+    assert pubo.to_qubo() == Q
+    assert pubo.to_pubo(3) == PUBO(pubo).to_pubo(3)
+
+    # every degree reuses the same pair counts
+    for deg in (2, 3, 2):
+        assert pubo.to_pubo(deg, pairs={('b', 'c')}) == PUBO(pubo).to_pubo(
+            deg, pairs={('b', 'c')}
+        )
+
+    # the output types agree with each other
+    P = pubo.to_pubo(2)
+    assert P == Q and type(P) == PUBOMatrix
+    assert pubo.to_pubo(2) == P and pubo.to_pubo(2) is not P
+    P[(0,)] += 10
+    assert pubo.to_qubo() == Q
+    assert pubo.to_pubo() == pubo.to_pubo(3)
+
+    # so do the spin conversions
+    L = pubo.to_quso()
+    assert L == qubo_to_quso(Q) and type(L) == QUSOMatrix
+    assert pubo.to_puso(2) == pubo_to_puso(Q)
+    assert pubo.to_puso() == pubo_to_puso(pubo.to_pubo())
+    L[(0,)] += 10
+    assert pubo.to_quso() != L
+
+    # any modification clears the cache
+    pubo[('a', 'b', 'c')] += 1
+    assert pubo.to_qubo() == PUBO(pubo).to_qubo() != Q
+    pubo *= 2
+    assert pubo.to_qubo() == PUBO(pubo).to_qubo()
+    pubo /= 2
+    assert pubo.to_qubo() == PUBO(pubo).to_qubo()
+    pubo.pop(('a',))
+    assert pubo.to_pubo() == PUBO(pubo).to_pubo()
+    del pubo[('a', 'b', 'c')]
+    assert pubo.to_pubo() == {(1, 2, 3): -2}
+    pubo.set_mapping({'b': 3, 'c': 2, 'd': 1, 'a': 0})
+    assert pubo.to_pubo() == {(1, 2, 3): -2}
+    pubo.set_reverse_mapping({0: 'b', 1: 'c', 2: 'd', 3: 'a'})
+    assert pubo.to_pubo() == {(0, 1, 2): -2}
+    pubo.clear()
+    assert pubo.to_pubo() == {} and pubo.to_qubo() == {}
+
+
+def test_pubo_copy_cache():
+
+    # a shallow copy does not share cached results with the original
+    pubo = PUBO({('a', 'b', 'c'): 1})
+    Q = pubo.to_qubo()
+    pubo2 = copy.copy(pubo)
+    pubo2[('a', 'b', 'c')] += 5
+    assert pubo2.to_qubo() == PUBO(pubo2).to_qubo() != Q
+    assert pubo.to_qubo() == Q == {
+        (3,): 6, (0, 1): 2, (0, 3): -4, (1, 3): -4, (2, 3): 1
+    }
+
+
+def test_pubo_value():
+
+    pubo = PUBO({('a', 'b', 'c'): 1, ('b', 'c'): -2, ('a',): 1, (): 3})
+    for x in ({'a': 1, 'b': 1, 'c': 1}, {'a': 0, 'b': 1, 'c': 1}):
+        assert pubo.value(x) == pubo_value(x, pubo)
+
+    # a partial assignment only fails if a missing variable is reached
+    assert pubo.value({'a': 0, 'b': 0}) == 3
+    assert_raises(KeyError, pubo.value, {'a': 1, 'b': 1})
+
+    # the packed terms are rebuilt when the model changes
+    x = {'a': 1, 'b': 1, 'c': 1}
+    pubo[('a', 'c')] += 4
+    assert pubo.value(x) == pubo_value(x, pubo) == 7
+
+    # and a shallow copy does not share them with the original
+    pubo2 = copy.copy(pubo)
+    pubo2[('a', 'c')] += 4
+    assert pubo2.value(x) == 11
+    assert pubo.value(x) == 7
+
+
+def test_pubo_degree_reduction_zero_term():
+
+    # a zero valued term still puts its variable in the mapping, so the
+    # ancilla must not reuse its label
+    pubo = PUBO({('x',): 0, ('a', 'b', 'c'): 1})
+    assert pubo.mapping == {'x': 0, 'a': 1, 'b': 2, 'c': 3}
+    Q = pubo.to_qubo()
+    assert Q == {(4,): 6, (1, 2): 2, (1, 4): -4, (2, 4): -4, (3, 4): 1}
+    assert all(k == Q.squash_key(k) for k in Q)
+    assert pubo.to_pubo(2) == Q
+
+    # the reduced models are filled without squashing, so check that every
+    # key already is, including when terms are zero or cancel
+    rng = random.Random(0)
+    for _ in range(50):
+        pubo = PUBO()
+        for _ in range(8):
+            key = tuple(rng.sample('abcdefg', rng.randint(0, 4)))
+            pubo[key] += rng.choice((-1, 0, 1))
+        for deg in (None, 2, 3):
+            P = pubo.to_pubo(deg)
+            assert all(k == P.squash_key(k) for k in P)
+        Q = pubo.to_qubo()
+        assert all(k == Q.squash_key(k) for k in Q)
+
+
 def test_pubo_degree_reduction_lam():
 
     pubo = PUBO({
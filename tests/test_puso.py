@@ -331,6 +331,8 @@ def test_puso_multiplication():
     d = temp.copy()
     assert d ** 2 == d * d
     assert d ** 3 == d * d * d
+    assert d ** 4 == d * d * d * d
+    assert d ** 5 == d * d * d * d * d
 
     d = PUSO({('0', 1): 1, ('1', 2): -1})**2
     assert d ** 4 == d * d * d * d
@@ -446,6 +448,18 @@ def test_puso_degree_reduction_pairs():
     assert qubo2.num_binary_variables - puso.num_binary_variables == 9
 
 
+def test_puso_value():
+
+    puso = PUSO({('a', 'b', 'c'): 1, ('b', 'c'): -2, ('a',): 1, (): 3})
+    for z in ({'a': 1, 'b': 1, 'c': 1}, {'a': -1, 'b': 1, 'c': -1}):
+        assert puso.value(z) == puso_value(z, puso)
+
+    # the packed terms are rebuilt when the model changes
+    z = {'a': -1, 'b': -1, 'c': 1}
+    puso[('a', 'c')] += 4
+    assert puso.value(z) == puso_value(z, puso) == 1
+
+
 def test_puso_degree_reduction_lam():
 
     puso = PUSO({
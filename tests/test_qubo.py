@@ -20,7 +20,8 @@ from qubovert import QUBO
 from qubovert.utils import (
     solve_qubo_bruteforce, solve_quso_bruteforce,
     solve_pubo_bruteforce, solve_puso_bruteforce,
-    qubo_value, QUBOMatrix
+    qubo_value, QUBOMatrix, PUBOMatrix, PUSOMatrix,
+    pubo_to_puso
 )
 from sympy import Symbol
 from numpy import allclose
@@ -66,10 +67,14 @@ problem = QUBO({('a',): -1, ('b',): 2, ('a', 'b'): -3, ('b', 'c'): -4, (): -2})
 solution = {'c': 1, 'b': 1, 'a': 1}
 obj = -8
 
+# the conversions of problem, computed once for the solve tests below.
+problem_qubo, problem_quso = problem.to_qubo(), problem.to_quso()
+problem_pubo, problem_puso = problem.to_pubo(), problem.to_puso()
+
 
 def test_qubo_qubo_solve():
 
-    e, sols = solve_qubo_bruteforce(problem.to_qubo())
+    e, sols = solve_qubo_bruteforce(problem_qubo)
     sol = problem.convert_solution(sols)
     assert problem.is_solution_valid(sol)
     assert problem.is_solution_valid(sols)
@@ -85,7 +90,7 @@ def test_qubo_qubo_solve():
 
 def test_qubo_quso_solve():
 
-    e, sols = solve_quso_bruteforce(problem.to_quso())
+    e, sols = solve_quso_bruteforce(problem_quso)
     sol = problem.convert_solution(sols)
     assert problem.is_solution_valid(sol)
     assert problem.is_solution_valid(sols)
@@ -95,7 +100,7 @@ def test_qubo_quso_solve():
 
 def test_qubo_pubo_solve():
 
-    e, sols = solve_pubo_bruteforce(problem.to_pubo())
+    e, sols = solve_pubo_bruteforce(problem_pubo)
     sol = problem.convert_solution(sols)
     assert problem.is_solution_valid(sol)
     assert problem.is_solution_valid(sols)
@@ -111,7 +116,7 @@ def test_qubo_pubo_solve():
 
 def test_qubo_puso_solve():
 
-    e, sols = solve_puso_bruteforce(problem.to_puso())
+    e, sols = solve_puso_bruteforce(problem_puso)
     sol = problem.convert_solution(sols)
     assert problem.is_solution_valid(sol)
     assert problem.is_solution_valid(sols)
@@ -119,6 +124,17 @@ def test_qubo_puso_solve():
     assert allclose(e, obj)
 
 
+def test_qubo_to_puso():
+
+    H = problem.to_puso()
+    assert type(H) == PUSOMatrix
+    assert type(problem.to_pubo()) == PUBOMatrix
+    assert H == pubo_to_puso(problem.to_pubo())
+    assert (H.degree, H.num_binary_variables) == (
+        2, problem.num_binary_variables
+    )
+
+
 def test_qubo_bruteforce_solve():
 
     assert problem.solve_bruteforce() == solution
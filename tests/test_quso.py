@@ -20,7 +20,8 @@ from qubovert import QUSO
 from qubovert.utils import (
     solve_qubo_bruteforce, solve_quso_bruteforce,
     solve_pubo_bruteforce, solve_puso_bruteforce,
-    quso_value, QUSOMatrix
+    quso_value, QUSOMatrix, PUBOMatrix, PUSOMatrix,
+    puso_to_pubo
 )
 from sympy import Symbol
 from numpy import allclose
@@ -66,10 +67,14 @@ problem = QUSO({('a',): -1, ('b',): 2,
                ('a', 'b'): -3, ('b', 'c'): -4, (): -2})
 solution = {'c': -1, 'b': -1, 'a': -1}
 
+# the conversions of problem, computed once for the solve tests below.
+problem_qubo, problem_quso = problem.to_qubo(), problem.to_quso()
+problem_pubo, problem_puso = problem.to_pubo(), problem.to_puso()
+
 
 def test_quso_qubo_solve():
 
-    e, sols = solve_qubo_bruteforce(problem.to_qubo())
+    e, sols = solve_qubo_bruteforce(problem_qubo)
     sol = problem.convert_solution(sols, False)
     assert problem.is_solution_valid(sol)
     assert problem.is_solution_valid(sols)
@@ -79,7 +84,7 @@ def test_quso_qubo_solve():
 
 def test_quso_quso_solve():
 
-    e, sols = solve_quso_bruteforce(problem.to_quso())
+    e, sols = solve_quso_bruteforce(problem_quso)
     sol = problem.convert_solution(sols)
     assert problem.is_solution_valid(sol)
     assert problem.is_solution_valid(sols)
@@ -95,7 +100,7 @@ def test_quso_quso_solve():
 
 def test_quso_pubo_solve():
 
-    e, sols = solve_pubo_bruteforce(problem.to_pubo())
+    e, sols = solve_pubo_bruteforce(problem_pubo)
     sol = problem.convert_solution(sols, False)
     assert problem.is_solution_valid(sol)
     assert problem.is_solution_valid(sols)
@@ -103,9 +108,20 @@ def test_quso_pubo_solve():
     assert allclose(e, -10)
 
 
+def test_quso_to_pubo():
+
+    P = problem.to_pubo()
+    assert type(P) == PUBOMatrix
+    assert type(problem.to_puso()) == PUSOMatrix
+    assert P == puso_to_pubo(problem.to_puso())
+    assert (P.degree, P.num_binary_variables) == (
+        2, problem.num_binary_variables
+    )
+
+
 def test_quso_puso_solve():
 
-    e, sols = solve_puso_bruteforce(problem.to_puso())
+    e, sols = solve_puso_bruteforce(problem_puso)
     sol = problem.convert_solution(sols)
     assert problem.is_solution_valid(sol)
     assert problem.is_solution_valid(sols)
@@ -26,12 +26,24 @@ from qubovert import QUBO, QUSO, PUBO, PUSO
 from sympy import Symbol
 import numpy as np
 from numpy.testing import assert_raises
+import random
 
 
 def test_qubo_to_quso_to_qubo():
 
     qubo = {(0,): 1, (0, 1): 1, (1,): -1, (1, 2): .2, (): -2, (2,): 1}
     assert qubo == quso_to_qubo(qubo_to_quso(qubo))
+    assert qubo_to_quso(QUBOMatrix(qubo)) == qubo_to_quso(qubo)
+    L = qubo_to_quso(QUBOMatrix(qubo))
+    assert (L.degree, L.num_binary_variables) == (2, 3)
+    Q = quso_to_qubo(L)
+    assert (Q.degree, Q.num_binary_variables) == (2, 3)
+
+    # zero terms are skipped, but their variables are mapped
+    L = qubo_to_quso({('a',): 2, ('b', 'a'): 0})
+    assert L == {('a',): -1, (): 1}
+    assert L.mapping == {'a': 0, 'b': 1}
+    assert qubo_to_quso(QUBOMatrix({(0,): 2})) == qubo_to_quso({(0,): 2})
 
     # type asserting
     assert type(qubo_to_quso(qubo)) == QUSO
@@ -50,6 +62,21 @@ def test_qubo_to_quso_to_qubo():
     assert type(qubo_to_quso(QUBO(qubo))) == QUSO
 
 
+def test_qubo_to_quso_large():
+
+    # converting a large QUBOMatrix gives the same result as converting it
+    # through a PUSOMatrix.
+    rng = random.Random(0)
+    Q = QUBOMatrix({(): 1.5, (0,): 1, (0, 1): -2, (1,): 1})
+    for _ in range(500):
+        Q[(rng.randrange(50), rng.randrange(50))] += rng.random()
+    L = qubo_to_quso(Q)
+    assert type(L) == QUSOMatrix
+    assert L == pubo_to_puso(PUBOMatrix(Q))
+    assert all(type(v) == float for v in L.values())
+    assert (L.degree, L.num_binary_variables) == (2, Q.num_binary_variables)
+
+
 def test_quso_to_qubo_to_quso():
 
     quso = {(0, 1): -4, (0, 2): 3, (): -2, (0,): 1, (2,): -2}
@@ -68,6 +95,13 @@ def test_quso_to_qubo_to_quso():
     assert type(quso_to_qubo(quso)) == QUBO
     assert type(quso_to_qubo(QUSO(quso))) == QUBO
 
+    # int values stay ints, and a key whose sum cancels out and is added to
+    # again goes to the end, just like adding the terms one at a time
+    quso = {(0, 1): 1, (0,): -1, (): 2}
+    for Q in (quso_to_qubo(quso), quso_to_qubo(QUSO(quso))):
+        assert list(Q.items()) == [((0, 1), 4), ((1,), -2), ((), 2)]
+        assert all(type(v) == int for v in Q.values())
+
 
 def test_pubo_to_puso_to_pubo():
 
@@ -76,6 +110,14 @@ def test_pubo_to_puso_to_pubo():
         (0, 2, 3): -3, (0, 1, 2): -2
     }
     assert pubo == puso_to_pubo(pubo_to_puso(pubo))
+    assert pubo_to_puso(PUBOMatrix(pubo)) == pubo_to_puso(pubo)
+    H = pubo_to_puso(PUBOMatrix(pubo))
+    assert (H.degree, H.num_binary_variables) == (3, 4)
+
+    # terms that cancel out are removed, but their variables are mapped
+    H = pubo_to_puso({('a',): 2, (): -1, ('b', 'a'): 0})
+    assert H == {('a',): -1}
+    assert H.mapping == {'a': 0, 'b': 1}
 
     # type asserting
     assert type(pubo_to_puso(pubo)) == PUSO
@@ -102,6 +144,15 @@ def test_puso_to_pubo_to_puso():
         (0, 1, 2): 3, (0, 2, 3): -1
     }
     assert puso == pubo_to_puso(puso_to_pubo(puso))
+    assert puso_to_pubo(PUSOMatrix(puso)) == puso_to_pubo(puso)
+    P = puso_to_pubo(PUSOMatrix(puso))
+    assert (P.degree, P.num_binary_variables) == (3, 4)
+
+    # zero terms add nothing, but their variables are still mapped in the
+    # order that they appear
+    P = puso_to_pubo({('a',): 1, ('c', 'b', 'a'): 0})
+    assert P == {('a',): -2, (): 1}
+    assert P.mapping == {'a': 0, 'c': 1, 'b': 2}
 
     # type asserting
     assert type(puso_to_pubo(puso)) == PUBO
@@ -137,10 +188,21 @@ def test_decimal_to_boolean():
 
     assert decimal_to_boolean(10, 7) == (0, 0, 0, 1, 0, 1, 0)
     assert decimal_to_boolean(10) == (1, 0, 1, 0)
+    assert decimal_to_boolean(0) == (0,)
+    assert decimal_to_boolean(0, 3) == (0, 0, 0)
+    assert decimal_to_boolean(np.int64(6), 4) == (0, 1, 1, 0)
+    for d in range(64):
+        assert boolean_to_decimal(decimal_to_boolean(d, 6)) == d
 
     with assert_raises(ValueError):
         decimal_to_boolean(.5)
 
+    with assert_raises(TypeError):
+        decimal_to_boolean(4.)
+
+    with assert_raises(ValueError):
+        decimal_to_boolean(0, 0)
+
     with assert_raises(ValueError):
         decimal_to_boolean(1000, 2)
 
@@ -170,6 +232,12 @@ def test_boolean_to_spin():
     assert boolean_to_spin((0, 1)) == (1, -1)
     assert boolean_to_spin([0, 1]) == [1, -1]
     assert boolean_to_spin({"a": 0, "b": 1}) == {"a": 1, "b": -1}
+    assert np.all(boolean_to_spin(np.array([0, 1, 1])) == [1, -1, -1])
+    assert np.all(
+        boolean_to_spin(np.array([[0, 1], [1, 0]])) == [[1, -1], [-1, 1]]
+    )
+    with assert_raises(KeyError):
+        boolean_to_spin(np.array([0, 2]))
 
 
 def test_spin_to_boolean():
@@ -179,6 +247,10 @@ def test_spin_to_boolean():
     assert spin_to_boolean((-1, 1)) == (1, 0)
     assert spin_to_boolean([-1, 1]) == [1, 0]
     assert spin_to_boolean({"a": -1, "b": 1}) == {"a": 1, "b": 0}
+    assert np.all(spin_to_boolean(np.array([-1, 1, 1])) == [1, 0, 0])
+    assert np.all(spin_to_boolean(np.array([-1., 1.])) == [1, 0])
+    with assert_raises(KeyError):
+        spin_to_boolean(np.array([0, 1]))
 
 
 def test_matrix_to_qubo():
@@ -192,6 +264,19 @@ def test_matrix_to_qubo():
     matrix, qubo = [[-3, 1], [-1, 2]], QUBOMatrix({(0,): -3, (1,): 2})
     assert matrix_to_qubo(matrix) == qubo
 
+    matrix = [[0, 1, -1], [2, 0, 0], [1, 3, 4]]
+    qubo = {(0, 1): 3, (1, 2): 3, (2,): 4}
+    Q = matrix_to_qubo(matrix)
+    assert Q == qubo
+    assert Q.degree == 2 and Q.num_binary_variables == 3
+
+    # values should be plain python numbers, not numpy scalars
+    Q = matrix_to_qubo(np.array([[0.5, 1.], [0., -2.]]))
+    assert Q == {(0,): .5, (0, 1): 1., (1,): -2.}
+    assert all(type(v) == float for v in Q.values())
+
+    assert matrix_to_qubo(np.zeros((3, 3))) == {}
+
     with assert_raises(ValueError):
         matrix_to_qubo([[1, 2, 3], [1, 0, 1]])
 
@@ -215,6 +300,16 @@ def test_qubo_to_matrix():
     assert matrix == qubo_to_matrix(qubo, array=False, symmetric=True)
     assert np.all(np.array(matrix) == qubo_to_matrix(qubo, symmetric=True))
 
+    qubo = {(0,): 1, (2,): -1}
+    assert qubo_to_matrix(qubo, array=False) == [[1, 0, 0], [0, 0, 0],
+                                                 [0, 0, -1]]
+    qubo = {(0, 2): 3, (1, 2): -1}
+    assert qubo_to_matrix(qubo, array=False, symmetric=True) == [
+        [0, 0, 1.5], [0, 0, -.5], [1.5, -.5, 0]
+    ]
+    assert matrix_to_qubo(qubo_to_matrix(qubo)) == qubo
+    assert matrix_to_qubo(qubo_to_matrix(qubo, symmetric=True)) == qubo
+
     with assert_raises(ValueError):
         qubo_to_matrix({})
 
@@ -212,6 +212,8 @@ def test_dictarithmetic_multiplication():
 
     d = temp.copy()
     assert d ** 3 == d * d * d
+    assert d ** 4 == d * d * d * d
+    assert d ** 5 == d * d * d * d * d
 
     # ___pow__to non integer power
     d = temp.copy()
@@ -276,5 +278,12 @@ def test_symbols():
     assert d.subs(b, 1) == {(0,): -a, (0, 1): 2, (1,): 1}
     assert d.subs({a: -3, b: 4}) == {(0,): 3, (0, 1): 2, (1,): 4}
 
+    # substitutions that can't be done all at once with xreplace
+    assert d.subs({a: b, b: 2}) == {(0,): -2, (0, 1): 2, (1,): 2}
+    d[(0, 1)] += a * b
+    assert d.subs(a * b, 3) == {(0,): -a, (0, 1): 5, (1,): b}
+    assert d.subs(a, '2') == {(0,): -2, (0, 1): 2 + 2 * b, (1,): b}
+    d[(0, 1)] -= a * b
+
     # rounding when symbols are involved.
     round(d)
@@ -110,6 +110,40 @@ def test_pubo_update():
     assert d == {(0, 1): 1, (1,): -1, (0, 1, 2): -3}
 
 
+def test_pubo_squash_key():
+
+    assert PUBOMatrix.squash_key(()) == ()
+    assert PUBOMatrix.squash_key((3,)) == (3,)
+    assert PUBOMatrix.squash_key((3, 3)) == (3,)
+    assert PUBOMatrix.squash_key((3, 1)) == (1, 3)
+    assert PUBOMatrix.squash_key((1, 3)) == (1, 3)
+    assert PUBOMatrix.squash_key((0, 4, 0, 3, 3, 2)) == (0, 2, 3, 4)
+    with assert_raises(KeyError):
+        PUBOMatrix.squash_key((0, -1))
+
+
+def test_pubo_update_squashed():
+
+    terms = {(0, 1): 1, (1,): -1, (0, 1, 3): -3, (2,): 0}
+    d = PUBOMatrix()
+    d._update_squashed(terms)
+    assert d == {(0, 1): 1, (1,): -1, (0, 1, 3): -3}
+    assert d == PUBOMatrix(terms)
+    assert d.degree == 3
+    assert d.num_binary_variables == 3
+    assert d.max_index == 3
+
+    d = PUBOMatrix._from_squashed(terms)
+    assert type(d) == PUBOMatrix
+    assert d == PUBOMatrix(terms)
+    assert (d.degree, d.num_binary_variables, d.name) == (3, 3, None)
+    d[(4,)] += 1
+    assert d.num_binary_variables == 4
+
+    d = PUBOMatrix._from_squashed({})
+    assert d == PUBOMatrix() and d.num_binary_variables == 0
+
+
 def test_pubo_num_binary_variables():
 
     d = PUBOMatrix({(0,): 1, (0, 3): 2, (0, 3, 4): -1})
@@ -92,6 +92,9 @@ def test_puso_reinitialize_dictionary():
     d = PUSOMatrix({(0,): 1, (1, 0): 2, (2, 0): 0, (0, 1): 1, (2, 0, 1): 1})
     assert d == {(0,): 1, (0, 1): 3, (0, 1, 2): 1}
 
+    d = PUSOMatrix({(1, 1): 1, (1, 0, 1): 2, (2, 0, 2, 2, 1): 1, (3, 0): 1})
+    assert d == {(): 1, (0,): 2, (0, 1, 2): 1, (0, 3): 1}
+
 
 def test_puso_update():
 
@@ -16,6 +16,7 @@
 Contains tests for the bruteforce solvers.
 """
 
+import random
 from qubovert.utils import (
     solve_qubo_bruteforce, solve_quso_bruteforce,
     solve_pubo_bruteforce, solve_puso_bruteforce
@@ -104,3 +105,84 @@ def test_solve_puso_bruteforce():
               {0: -1, 1: 1, 3: 1, 4: 1, 5: 1},
               {0: -1, 1: -1, 3: 1, 4: 1, 5: 1}])
     )
+
+
+def test_solve_bruteforce_repeated_labels():
+
+    # a repeated spin squares to 1, whereas a repeated boolean is unchanged
+    H = {(0, 0): -1, (0, 1, 1): 2, (1,): 1}
+    assert solve_puso_bruteforce(H) == (-4, {0: -1, 1: -1})
+    P = {(0, 0): -1, (0, 1, 1): 2, (1,): 1}
+    assert solve_pubo_bruteforce(P) == (-1, {0: 1, 1: 0})
+
+
+def test_solve_bruteforce_valid():
+
+    P = {(0,): -1, (1,): -1, (0, 1): 1}
+    assert solve_pubo_bruteforce(P, True) == (
+        -1, [{0: 0, 1: 1}, {0: 1, 1: 0}, {0: 1, 1: 1}]
+    )
+    assert solve_pubo_bruteforce(P, True, lambda x: x[0]) == (
+        -1, [{0: 1, 1: 0}, {0: 1, 1: 1}]
+    )
+    assert solve_qubo_bruteforce(P, valid=lambda x: not x[0]) == (
+        -1, {0: 0, 1: 1}
+    )
+
+    L = {(0,): 1, (0, 1): 1}
+    assert solve_quso_bruteforce(L, True) == (-2, [{0: -1, 1: 1}])
+    assert solve_quso_bruteforce(L, valid=lambda z: z[0] == 1) == (
+        0, {0: 1, 1: -1}
+    )
+
+
+def test_solve_bruteforce_many_variables():
+
+    # integer models with many variables are enumerated with numpy, whereas a
+    # valid function always goes through the Gray code loop, and float models
+    # through the python loop.
+    rng = random.Random(0)
+    for n in (8, 12):
+        P = {
+            tuple(rng.sample(range(n), rng.randint(0, 3))):
+            rng.randint(-3, 3)
+            for _ in range(3 * n)
+        }
+        P[tuple(range(n))] = 1  # so that every variable is in the model
+        for f in (solve_pubo_bruteforce, solve_puso_bruteforce):
+            for all_solutions in (False, True):
+                res = f(P, all_solutions)
+                assert res == f(P, all_solutions, lambda x: True)
+                F = {k: float(v) for k, v in P.items()}
+                assert res == f(F, all_solutions)
+
+    # ties are all found, including across chunks of assignments
+    P = {(i,): i for i in range(17)}
+    assert solve_pubo_bruteforce(P, True) == (0, [
+        {i: 0 for i in range(17)}, {i: int(not i) for i in range(17)}
+    ])
+
+
+def test_solve_bruteforce_integer():
+
+    # integer models are enumerated in Gray code order, but the solutions are
+    # the same as for the equivalent float model, which is not.
+    rng = random.Random(1)
+    for n in (3, 6):
+        P = {
+            tuple(rng.sample(range(n), rng.randint(0, 3))):
+            rng.randint(-2, 2)
+            for _ in range(3 * n)
+        }
+        P[tuple(range(n))] = 1  # so that every variable is in the model
+        F = {k: float(v) for k, v in P.items()}
+        for f in (solve_pubo_bruteforce, solve_puso_bruteforce):
+            for all_solutions in (False, True):
+                for valid in (lambda x: True, lambda x: x[0] != x[n - 1]):
+                    res = f(P, all_solutions, valid)
+                    assert type(res[0]) == int
+                    assert res == f(F, all_solutions, valid)
+
+    assert solve_pubo_bruteforce({(0,): 1}, True, lambda x: False) == (
+        None, [{}]
+    )